@@ -0,0 +1,381 @@
+# pset1_cli.py
+
+"""
+One command-line entry point for every Assignment1 algorithm:
+PageRank and HITS (pset1_q1), arithmetic coding (pset1_q5), the LZ
+codecs (pset1_q6) and RHT quantization (pset1_q7), on user-supplied
+files or on inputs generated at any scale.
+
+Examples:
+    python pset1_cli.py pagerank --example
+    python pset1_cli.py --timeit 5 pagerank --nodes 1000000 --edges 10000000
+    python pset1_cli.py --profile hits --graph edges.txt --method lanczos
+    python pset1_cli.py --timeit 3 arith --input book.txt --order 1
+    python pset1_cli.py lz --codec LZW --size 1000000 --block-size 65536 --workers 4
+    python pset1_cli.py --profile rht --dim 4096 --trials 10000 --quantizer uniform --bits 4
+
+--timeit, --profile, --seed and --output go before the command name.
+
+Every command prints a JSON report of its results. --timeit N repeats the
+run N times and adds wall time, per-phase timings and counters (iteration
+counts, sizes) to the report; --profile adds one more run under tracemalloc
+with the allocations of every phase and the top allocation sites. Traced
+runs are much slower, so their times are never mixed with --timeit's.
+"""
+
+# +++++++++++++++++ Installs/Imports +++++++++++++++++ #
+import io
+import os
+import sys
+import json
+import time
+import zlib
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+import scipy
+
+import pset1_q1 as q1
+import pset1_q5 as q5
+import pset1_q6 as q6
+import pset1_q7 as q7
+
+
+
+# ++++++++++++++++++++ Profiler ++++++++++++++++++++++ #
+
+class Profiler:
+    """
+    Collects what one run of a command measures: wall time of each phase,
+    counters (iteration counts, sizes, ...) and, if trace_memory is set,
+    the memory each phase allocated (tracemalloc must already be running).
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        """ Time the body of a with block as phase name. """
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = {"seconds": time.perf_counter() - start}
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                # memory still held after the phase, and the most it needed on top of what was there before
+                entry["allocated_bytes"] = current - before
+                entry["peak_bytes"] = peak - before
+            self.phases[name] = entry
+
+    def count(self, name, value):
+        """ Record a counter, e.g. the number of iterations a solver ran. """
+        self.counters[name] = value
+
+def _summary(values):
+    """ min / mean / max of a list of timings. """
+    return {"min": min(values), "mean": sum(values) / len(values), "max": max(values), "runs": len(values)}
+
+def _git_commit():
+    """ Commit of the working tree, to tell reports of different versions apart (None outside git). """
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+def _environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+def run_command(run, args, timeit=0, profile=False, top_allocations=10):
+    """
+    Run a command function run(args, profiler) -> results (JSON-compatible)
+    and build its report.
+    timeit:     number of timed runs (0: a single run, reported without timings)
+    profile:    add a run under tracemalloc, reporting allocations per phase
+                and the top_allocations allocation sites by size
+    """
+    report = {"command": args.command, "args": {k: v for k, v in vars(args).items() if k not in ("func", "command")}}
+    runs = []
+    for _ in range(max(1, timeit)):
+        profiler = Profiler()
+        start = time.perf_counter()
+        results = run(args, profiler)
+        runs.append((time.perf_counter() - start, profiler))
+    report["results"] = results
+    if timeit:
+        report["environment"] = _environment()
+        report["wall_seconds"] = _summary([wall for wall, _ in runs])
+        report["phases"] = {name: _summary([profiler.phases[name]["seconds"] for _, profiler in runs])
+                            for name in runs[0][1].phases}
+        report["counters"] = runs[-1][1].counters
+    if profile:
+        # separate traced run: tracemalloc slows the code down, so its times aren't mixed with the timed runs
+        profiler = Profiler(trace_memory=True)
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            run(args, profiler)
+            wall = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        stats = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).statistics("lineno")
+        report.setdefault("environment", _environment())
+        report["profile"] = {
+            "wall_seconds": wall,
+            "peak_bytes": peak,
+            "phases": profiler.phases,
+            "counters": profiler.counters,
+            "top_allocations": [{"site": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                                for stat in stats[:top_allocations]],
+        }
+    return report
+
+
+
+# ++++++++++++++++++++++ Inputs ++++++++++++++++++++++ #
+
+def load_graph(args):
+    """
+    The graph of a pagerank/hits command, as a CSR matrix:
+    --example:  the 6-node graph A of pset1_q1
+    --graph:    a CSR directory (from save_csr / convert_edge_list), loaded
+                memory-mapped, or an edge list file, converted once into a
+                CSR directory next to it (PATH.csr) and reused after that
+    otherwise:  a random graph of --nodes nodes and --edges edges
+    """
+    if args.example:
+        return q1.edges_to_csr(*np.nonzero(q1.A), N=q1.A.shape[0])
+    if args.graph:
+        if os.path.isdir(args.graph):
+            return q1.load_csr(args.graph)
+        graph_dir = args.graph + ".csr"
+        if os.path.isdir(graph_dir) and os.path.getmtime(graph_dir) >= os.path.getmtime(args.graph):
+            return q1.load_csr(graph_dir)
+        return q1.convert_edge_list(args.graph, graph_dir, binary_dtype=args.binary_dtype)
+    rng = np.random.default_rng(args.seed)
+    return q1.edges_to_csr(rng.integers(0, args.nodes, args.edges), rng.integers(0, args.nodes, args.edges), args.nodes)
+
+def load_data(args):
+    """ The bytes of an arith/lz command: --input file, or --size bytes of a make_corpus input. """
+    if args.input:
+        with open(args.input, "rb") as f:
+            return f.read()
+    return q6.make_corpus(args.size, args.seed)[args.corpus]
+
+def _top(scores, k=10):
+    """ The k highest-scoring nodes as [node, score] pairs. """
+    top = np.argsort(scores)[::-1][:k]
+    return [[int(i), float(scores[i])] for i in top]
+
+
+
+# ++++++++++++++++++++++ Commands ++++++++++++++++++++++ #
+# Every command is run(args, profiler) -> results: it times its phases
+# with profiler.phase(...), records counters with profiler.count(...) and
+# returns a JSON-compatible dict of results.
+
+def run_pagerank(args, profiler):
+    with profiler.phase("load"):
+        G = load_graph(args)
+    profiler.count("nodes", G.shape[0])
+    profiler.count("edges", int(G.nnz))
+    with profiler.phase("pagerank"):
+        if args.method == "parallel":
+            PR, iterations = q1.compute_pagerank_parallel(G, args.damping, args.tol, args.max_iter, args.workers,
+                                                          return_iterations=True)
+        else:
+            PR, iterations = q1.compute_pagerank_sparse(G, args.damping, args.tol, args.max_iter, return_iterations=True)
+    profiler.count("iterations", iterations)
+    return {"nodes": G.shape[0], "edges": int(G.nnz), "iterations": iterations, "top": _top(PR, args.top)}
+
+def run_hits(args, profiler):
+    with profiler.phase("load"):
+        G = load_graph(args)
+    profiler.count("nodes", G.shape[0])
+    profiler.count("edges", int(G.nnz))
+    with profiler.phase("hits"):
+        h, a, residuals = q1.compute_hubsauthorities_sparse(G, args.tol, args.max_iter, method=args.method)
+    # the Lanczos solver doesn't report its iterations, only the final residual
+    iterations = len(residuals) if args.method == "power" else None
+    profiler.count("iterations", iterations)
+    return {"nodes": G.shape[0], "edges": int(G.nnz), "iterations": iterations, "residual": float(residuals[-1]),
+            "top_hubs": _top(h, args.top), "top_authorities": _top(a, args.top)}
+
+def run_arith(args, profiler):
+    with profiler.phase("load"):
+        data = load_data(args)
+    chars = list(range(256))
+
+    def make_model():
+        if args.order is not None:
+            return q5.AdaptiveModel(chars, args.order)
+        # static model from the data's own byte frequencies (not counting the cost of sending them)
+        counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+        return q5.FrequencyModel((counts / max(1, len(data))).tolist(), chars)
+
+    with profiler.phase("model"):
+        model = make_model()
+    out = io.BytesIO()
+    with profiler.phase("encode"):
+        num_bytes = q5.range_encode(data, None, None, out, model=model)
+    with profiler.phase("decode"):
+        out.seek(0)
+        restored = bytes(q5.range_decode(out, None, None, model=make_model()))
+    profiler.count("symbols", len(data))
+    profiler.count("compressed_bytes", num_bytes)
+    return {"input_bytes": len(data), "compressed_bytes": num_bytes,
+            "ratio": len(data) / max(1, num_bytes), "round_trip": restored == data}
+
+def run_lz(args, profiler):
+    with profiler.phase("load"):
+        data = load_data(args)
+    if args.block_size:
+        if args.codec not in q6.BLOCK_CODECS:
+            raise SystemExit(f"block mode supports {list(q6.BLOCK_CODECS)}, not {args.codec}")
+        with profiler.phase("compress"):
+            compressed = q6.compress_blocks(data, args.codec, args.block_size, workers=args.workers)
+        with profiler.phase("decompress"):
+            restored = b"".join(q6.decompress_blocks(compressed, workers=args.workers))
+        profiler.count("blocks", len(q6.read_block_index(compressed)[3]))
+    elif args.codec == "zlib":
+        with profiler.phase("compress"):
+            compressed = zlib.compress(data)
+        with profiler.phase("decompress"):
+            restored = zlib.decompress(compressed)
+    else:
+        # the token stream and its bit-packing are timed separately
+        compress, pack, unpack, decompress = {
+            "LZ77": (q6.compress_LZ77_fast, q6.pack_LZ77, q6.unpack_LZ77, q6.decompress_LZ77),
+            "LZ78": (q6.compress_LZ78, q6.pack_LZ78, q6.unpack_LZ78, q6.decompress_LZ78),
+            "LZW": (lambda data: q6.compress_LZW(data, q6.BYTE_TABLE), q6.pack_LZW, q6.unpack_LZW,
+                    lambda codes: q6.decompress_LZW(codes, q6.BYTE_TABLE)),
+        }[args.codec]
+        with profiler.phase("compress"):
+            tokens = compress(data)
+        with profiler.phase("pack"):
+            compressed = pack(tokens)
+        with profiler.phase("decompress"):
+            restored = b"".join(decompress(unpack(compressed)))
+        profiler.count("tokens", len(tokens))
+    profiler.count("input_bytes", len(data))
+    profiler.count("compressed_bytes", len(compressed))
+    return {"input_bytes": len(data), "compressed_bytes": len(compressed),
+            "ratio": len(data) / max(1, len(compressed)), "round_trip": restored == data}
+
+def run_rht(args, profiler):
+    dtype = np.dtype(args.dtype)
+    with profiler.phase("generate"):
+        rng = np.random.default_rng(args.seed)
+        X = rng.standard_normal((args.trials, args.dim), dtype=dtype)
+        X /= np.linalg.norm(X, axis=1, keepdims=True)
+    with profiler.phase("roundtrip"):
+        recovered, encode_time, decode_time, size = q7.quantize_roundtrip(X, args.quantizer, args.bits, args.seed)
+    with profiler.phase("error"):
+        mse = np.mean((recovered - X) ** 2, axis=1)
+    profiler.count("trials", args.trials)
+    profiler.count("bytes_per_vector", size)
+    return {"trials": args.trials, "dim": args.dim, "bytes_per_vector": size,
+            "encode_seconds": encode_time, "decode_seconds": decode_time,
+            "min_mse": float(mse.min()), "mean_mse": float(mse.mean()), "max_mse": float(mse.max())}
+
+
+
+# ++++++++++++++++++ Argument Parsing ++++++++++++++++++ #
+
+def _add_graph_arguments(parser):
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--example", action="store_true", help="the 6-node graph A of pset1_q1")
+    source.add_argument("--graph", help="CSR directory or edge list file (one 'src dst' pair per line)")
+    parser.add_argument("--binary-dtype", help="integer dtype of a raw binary edge list, e.g. int32")
+    parser.add_argument("--nodes", type=int, default=100_000, help="nodes of the generated graph")
+    parser.add_argument("--edges", type=int, default=1_000_000, help="edges of the generated graph")
+    parser.add_argument("--tol", type=float, default=1e-8, help="convergence tolerance (e)")
+    parser.add_argument("--top", type=int, default=10, help="number of top-scoring nodes to report")
+
+def _add_data_arguments(parser):
+    parser.add_argument("--input", help="file to compress (default: a generated corpus)")
+    parser.add_argument("--size", type=int, default=1 << 16, help="bytes of the generated corpus")
+    parser.add_argument("--corpus", default="text", choices=["text", "binary", "repetitive", "random"],
+                        help="kind of generated corpus")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run and profile the Assignment1 algorithms.")
+    parser.add_argument("--timeit", type=int, default=0, metavar="N",
+                        help="repeat the run N times and report wall time, per-phase timings and counters")
+    parser.add_argument("--profile", action="store_true",
+                        help="add a tracemalloc run reporting allocations per phase and top allocation sites")
+    parser.add_argument("--seed", type=int, default=0, help="seed for generated inputs")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pagerank = commands.add_parser("pagerank", help="PageRank (pset1_q1)")
+    _add_graph_arguments(pagerank)
+    pagerank.add_argument("--method", default="sparse", choices=["sparse", "parallel"])
+    pagerank.add_argument("--damping", type=float, default=0.95, help="damping parameter (d)")
+    pagerank.add_argument("--max-iter", type=int, default=100)
+    pagerank.add_argument("--workers", type=int, default=4, help="threads for --method parallel")
+    pagerank.set_defaults(func=run_pagerank)
+
+    hits = commands.add_parser("hits", help="HITS hubs and authorities (pset1_q1)")
+    _add_graph_arguments(hits)
+    hits.add_argument("--method", default="power", choices=["power", "lanczos"])
+    hits.add_argument("--max-iter", type=int, default=1000)
+    hits.set_defaults(func=run_hits)
+
+    arith = commands.add_parser("arith", help="integer arithmetic coding (pset1_q5)")
+    _add_data_arguments(arith)
+    arith.add_argument("--order", type=int, help="order of an adaptive context model (default: static model)")
+    arith.set_defaults(func=run_arith)
+
+    lz = commands.add_parser("lz", help="LZ77 / LZ78 / LZW codecs (pset1_q6)")
+    _add_data_arguments(lz)
+    lz.add_argument("--codec", default="LZW", choices=list(q6.CODECS))
+    lz.add_argument("--block-size", type=int, help="use block mode with blocks of this many bytes")
+    lz.add_argument("--workers", type=int, help="processes for block mode (default: one per CPU)")
+    lz.set_defaults(func=run_lz)
+
+    rht = commands.add_parser("rht", help="RHT quantization (pset1_q7)")
+    rht.add_argument("--dim", type=int, default=1024)
+    rht.add_argument("--trials", type=int, default=100)
+    rht.add_argument("--quantizer", default="sign", choices=list(q7.QUANTIZERS))
+    rht.add_argument("--bits", type=int, default=1)
+    rht.add_argument("--dtype", default="float64", choices=["float32", "float64"])
+    rht.set_defaults(func=run_rht)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = run_command(args.func, args, timeit=args.timeit, profile=args.profile)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return report
+
+
+
+# +++++++++++++++++++ Main Function +++++++++++++++++++ #
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
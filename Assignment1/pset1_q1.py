@@ -8,7 +8,14 @@ scores (for example, what scaling methods you are using, if any).
 """
 
 # +++++++++++++++++ Installs/Imports +++++++++++++++++ #
+import os
+import time
+import itertools
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import svds
 
 
 
@@ -59,24 +66,26 @@ def compute_pagerank(A, d=0.95, e=1e-8, max_iter=100):
         PR = new_PR
     return PR
 
-def compute_hubsauthorities(A, e=1e-8):
+def compute_hubsauthorities(A, e=1e-8, max_iter=1000, h0=None, a0=None):
     """
     Compute Hub and Authority weights from adjacency matrix.
     Follow from personal lecture notes.
     A:          adjacency matrix where A[j][i] = 1 if j points to i
     e:          epsilon, for quick-stop convergence
+    max_iter:   if we're not converging fast enough, stop after this # iterations
+    h0, a0:     initial hub and authority weights (warm start), uniform if not given
     """
-    # Initialize hub (h) and authority (a) scores uniformly
+    # Initialize hub (h) and authority (a) scores uniformly (or from a previous solution)
     # In paper, they're called y and x, but let's just use intuitive notation
     n = A.shape[0]
-    h = np.ones(n)
-    a = np.ones(n)
+    h = np.ones(n) if h0 is None else np.array(h0, dtype=float)
+    a = np.ones(n) if a0 is None else np.array(a0, dtype=float)
     # As per the paper, normalize vectors so that sum of their squares is 1
     h /= np.linalg.norm(h, 2)
     a /= np.linalg.norm(a, 2)
     # Keep track of iteration value for output-purposes
     iteration = 0
-    while True:
+    while iteration < max_iter:
         # Update authority scores: a = A^T h
         # Normalize weights to allow for convergence
         a_new = A.T @ h
@@ -95,11 +104,681 @@ def compute_hubsauthorities(A, e=1e-8):
 
 
 
+# +++++++++++++++++ Sparse Functions +++++++++++++++++ #
+def edges_to_csr(src, dst, N=None, weights=None):
+    """
+    Build a sparse CSR adjacency matrix from edge arrays.
+    Same convention as the dense A: row j, column i is set if j points to i.
+    Duplicate edges are summed, so they act as weighted links.
+    src:        array of source node ids (the j's)
+    dst:        array of destination node ids (the i's)
+    N:          number of nodes, inferred from the largest id if not given
+    weights:    optional edge weights, every edge counts as 1 if not given
+    """
+    src = np.asarray(src)
+    dst = np.asarray(dst)
+    if N is None:
+        N = int(max(src.max(initial=-1), dst.max(initial=-1))) + 1
+    # int32 indices halve the index memory whenever the graph allows it
+    idx_dtype = np.int32 if max(N, len(src)) < 2**31 else np.int64
+    data = np.ones(len(src)) if weights is None else np.asarray(weights, dtype=float)
+    G = sp.coo_matrix((data, (src.astype(idx_dtype), dst.astype(idx_dtype))), shape=(N, N)).tocsr()
+    G.sum_duplicates()
+    return G
+
+def as_csr(A):
+    """
+    Convert a dense adjacency matrix (like A above) or any scipy sparse
+    matrix to CSR. CSR input is returned as-is, without copying.
+    """
+    if sp.issparse(A):
+        return A.tocsr()
+    return sp.csr_matrix(np.asarray(A, dtype=float))
+
+def _inverse_out_degree(G):
+    """
+    Helper returning (1 / out-degree, with 0 for dangling pages) and the
+    boolean dangling mask of a CSR graph.
+    """
+    # summed in float64, so graphs stored with float32 weights still get float64 degrees
+    out_degree = np.asarray(G.sum(axis=1), dtype=np.float64).ravel()
+    inv_degree = np.zeros(G.shape[0])
+    np.divide(1.0, out_degree, out=inv_degree, where=out_degree != 0)
+    return inv_degree, out_degree == 0
+
+def compute_pagerank_sparse(G, d=0.95, e=1e-8, max_iter=100, return_iterations=False):
+    """
+    Compute PageRank from a sparse adjacency matrix.
+    Same model as compute_pagerank, but each iteration is one sparse
+    mat-vec, so the cost is O(edges) per iteration instead of O(N^2).
+    Unlike compute_pagerank, pages without out-links (dangling nodes) are
+    handled explicitly: their PageRank is spread uniformly over all pages.
+    G:          adjacency matrix (CSR, other sparse format, or dense), G[j, i] != 0 if j points to i
+    d:          damping parameter, set to 0.95 (= 1 makes little difference)
+    e:          epsilon, for quick-stop convergence
+    max_iter:   if we're not converging fast enough, stop after this # iterations
+    return_iterations:  if True, return (PR, number of iterations run)
+    """
+    G = as_csr(G)
+    N = G.shape[0]
+    # Step 1: compute every page's out-degree once, up front
+    # (the dense version re-sums A[j] inside its innermost loop)
+    inv_degree, dangling = _inverse_out_degree(G)
+    dangling = np.flatnonzero(dangling)
+    # G.T is a CSC view over the same arrays, so G.T @ x costs no copy
+    GT = G.T
+    # Step 2: set the initial PageRank to 1/N for each page
+    PR = np.ones(N) / N
+    # Step 3: iterate for a maximum number of iterations or until convergence
+    iterations = 0
+    for _ in range(max_iter):
+        iterations += 1
+        # each page j sends PR[j] / outdegree(j) along each of its out-links
+        new_PR = GT @ (PR * inv_degree)
+        # dangling pages send their PageRank to every page, then apply damping (d)
+        new_PR = d * new_PR + ((1 - d) + d * PR[dangling].sum()) / N
+        # if the difference between new PR and old PR is below tolerance, no need to continue
+        if np.linalg.norm(new_PR - PR, 1) < e:
+            break
+        PR = new_PR
+    return (PR, iterations) if return_iterations else PR
+
+def compute_personalized_pagerank(G, teleport, d=0.95, e=1e-8, max_iter=100, block_size=16):
+    """
+    Compute personalized PageRank for many teleport distributions at once.
+    Columns are iterated together, block_size at a time, with one sparse
+    matrix x dense block product per iteration, so each pass over the edge
+    arrays is shared by the whole block instead of paid once per seed set.
+    Columns that have converged are frozen and dropped from the block, so
+    they stop costing compute.
+    Dangling pages send their PageRank back to the column's teleport
+    distribution; with a uniform teleport column this gives the same scores
+    as compute_pagerank_sparse.
+    G:          adjacency matrix (CSR, other sparse format, or dense), G[j, i] != 0 if j points to i
+    teleport:   (N x k) matrix, column c is the teleport distribution of seed set c
+                (columns are normalized to sum to 1, so each must have a positive sum)
+    d:          damping parameter, set to 0.95 (= 1 makes little difference)
+    e:          epsilon, for quick-stop convergence (checked per column)
+    max_iter:   if we're not converging fast enough, stop after this # iterations
+    block_size: columns iterated together; past ~16 the dense block no
+                longer fits in cache and the per-column cost goes back up
+    """
+    G = as_csr(G)
+    V = np.asarray(teleport, dtype=float)
+    if V.ndim == 1:
+        V = V[:, None]
+    sums = V.sum(axis=0, keepdims=True)
+    # a column with nothing to teleport to can't be normalized (it would turn into NaNs)
+    bad = np.flatnonzero(~(sums[0] > 0))
+    if len(bad):
+        raise ValueError(f"teleport columns {bad.tolist()} must have a positive sum")
+    V = V / sums
+    # Step 1: compute every page's out-degree once, up front
+    inv_degree, dangling = _inverse_out_degree(G)
+    dangling = np.flatnonzero(dangling)
+    inv_degree = inv_degree[:, None]
+    GT = G.T
+    PR = np.empty_like(V)
+    for first in range(0, V.shape[1], block_size):
+        # Step 2: start every column of the block from its own teleport distribution
+        cols = np.arange(first, min(first + block_size, V.shape[1]))
+        X = V[:, cols].copy()
+        T = X.copy()
+        # Step 3: iterate all still-active columns of the block together
+        for _ in range(max_iter):
+            new_X = GT @ (X * inv_degree)
+            # dangling mass plus the (1 - d) teleport mass both go back to the teleport vector
+            new_X *= d
+            new_X += T * ((1 - d) + d * X[dangling].sum(axis=0))
+            converged = np.abs(new_X - X).sum(axis=0) < e
+            X = new_X
+            # freeze the columns whose change is below tolerance
+            if converged.any():
+                PR[:, cols[converged]] = X[:, converged]
+                cols, X, T = cols[~converged], X[:, ~converged], T[:, ~converged]
+                if len(cols) == 0:
+                    break
+        PR[:, cols] = X
+    return PR
+
+def apply_edge_delta(G, added=None, removed=None):
+    """
+    Return a new CSR graph with edges added and/or removed.
+    G:          adjacency matrix (CSR, other sparse format, or dense)
+    added:      (src, dst) pair of arrays of edges to add, or None
+    removed:    (src, dst) pair of arrays of edges to remove, or None
+    """
+    G = as_csr(G)
+    N = G.shape[0]
+    new_G = G.copy()
+    if added is not None:
+        new_G = new_G + edges_to_csr(added[0], added[1], N=N)
+    if removed is not None:
+        new_G = new_G - edges_to_csr(removed[0], removed[1], N=N)
+        # removing an edge that was never there must not leave a negative link
+        np.maximum(new_G.data, 0, out=new_G.data)
+    new_G.eliminate_zeros()
+    return new_G
+
+def update_pagerank(G, PR, added=None, removed=None, d=0.95, e=1e-8, max_iter=100):
+    """
+    Incrementally update PageRank after a small edge delta.
+    Instead of restarting from 1/N, warm-start from the previous scores and
+    only propagate the mass that the delta moved, using a local push method:
+    every page keeps a residual (how much PageRank it is still owed), and
+    pages with a large residual push it to their out-links. Only the
+    out-links of pages whose edges changed start with a residual, so the
+    work stays near the delta.
+    Same model as compute_pagerank_sparse (dangling pages link to every page).
+    Returns (new PageRank, new graph).
+    G:          adjacency matrix the previous scores were computed on
+    PR:         previous PageRank scores (e.g. from compute_pagerank_sparse)
+    added:      (src, dst) pair of arrays of edges to add, or None
+    removed:    (src, dst) pair of arrays of edges to remove, or None
+    d:          damping parameter, set to 0.95 (= 1 makes little difference)
+    e:          epsilon, stop once the total (L1) residual is below e
+    max_iter:   if we're not converging fast enough, stop after this # push rounds
+    """
+    G = as_csr(G)
+    N = G.shape[0]
+    new_G = apply_edge_delta(G, added, removed)
+    PR = np.array(PR, dtype=float)
+    # Step 1: the pages whose out-links changed
+    changed = [np.asarray(edges[0]) for edges in (added, removed) if edges is not None]
+    changed = np.unique(np.concatenate(changed)) if changed else np.zeros(0, dtype=int)
+    old_inv, old_dangling = _inverse_out_degree(G[changed])
+    inv_degree, dangling = _inverse_out_degree(new_G)
+    GT = new_G.T
+    # Step 2: initial residual = what the changed pages now send minus what they used to send
+    # (the previous scores are assumed converged, so everything else owes nothing)
+    r = d * (new_G[changed].T @ (PR[changed] * inv_degree[changed]))
+    r -= d * (G[changed].T @ (PR[changed] * old_inv))
+    r += d * (PR[changed][dangling[changed]].sum() - PR[changed][old_dangling].sum()) / N
+    # Step 3: push rounds, each moving every large residual into the scores and on to the out-links
+    # a per-page threshold of e / N guarantees a total residual below e once nothing is left to push
+    threshold = e / N
+    for _ in range(max_iter):
+        if np.abs(r).sum() < e:
+            break
+        active = np.flatnonzero(np.abs(r) > threshold)
+        pushed = r[active]
+        PR[active] += pushed
+        r[active] = 0
+        if len(active) * 8 < N:
+            # local round: only the out-links of the active pages are touched
+            r += d * (new_G[active].T @ (pushed * inv_degree[active]))
+        else:
+            # the residual has spread over most of the graph, so slicing rows out
+            # costs more than one sweep over all edges
+            z = np.zeros(N)
+            z[active] = pushed
+            r += d * (GT @ (z * inv_degree))
+        r += d * pushed[dangling[active]].sum() / N
+    return PR, new_G
+
+def _normalize(v):
+    """
+    Helper scaling v to unit L2 norm (a zero vector is left as-is).
+    """
+    norm = np.linalg.norm(v, 2)
+    return v / norm if norm > 0 else v
+
+def compute_hubsauthorities_sparse(G, e=1e-8, max_iter=1000, use_fresh=True, method="power", h0=None, a0=None):
+    """
+    Compute Hub and Authority weights from a sparse adjacency matrix.
+    Same model as compute_hubsauthorities, with each update as one sparse mat-vec.
+    Returns (h, a, residuals), where residuals[t] is the larger of the L2
+    changes of h and a at iteration t, to see how many iterations a graph
+    really needs and tune e.
+    G:          adjacency matrix (CSR, other sparse format, or dense), G[j, i] != 0 if j points to i
+    e:          epsilon, for quick-stop convergence
+    max_iter:   if we're not converging fast enough, stop after this # iterations
+    use_fresh:  if True, update hubs from the freshly updated authorities (h = A a_new),
+                which is one A A^T power step per iteration instead of a half step;
+                if False, use the previous authorities like compute_hubsauthorities
+    method:     "power" for power iteration, or "lanczos" to compute the top singular
+                vectors of G directly with scipy's svds (hubs = left, authorities = right);
+                its residual trace has a single entry, ||G^T h - s a||
+    h0, a0:     initial hub and authority weights (warm start, e.g. the converged
+                weights of an overlapping graph), uniform if not given;
+                for "lanczos", h0 is the starting vector of svds
+    """
+    G = as_csr(G)
+    n = G.shape[0]
+    if method == "lanczos":
+        # the top singular vectors of A are exactly the HITS fixed point
+        u, s, vt = svds(G.astype(float), k=1, tol=e, maxiter=max_iter, v0=h0)
+        # the singular vectors are only defined up to sign; hub/authority weights are non-negative
+        h = np.abs(u[:, 0])
+        a = np.abs(vt[0])
+        return h, a, [float(np.linalg.norm(G.T @ h - s[0] * a, 2))]
+    if method != "power":
+        raise ValueError(f"unknown method {method!r}, expected 'power' or 'lanczos'")
+    # Initialize hub (h) and authority (a) scores uniformly (or from h0/a0), normalized to unit L2 norm
+    h = np.ones(n) / np.sqrt(n) if h0 is None else _normalize(np.asarray(h0, dtype=float))
+    a = np.ones(n) / np.sqrt(n) if a0 is None else _normalize(np.asarray(a0, dtype=float))
+    # G.T is a CSC view over the same arrays, so G.T @ x costs no copy
+    GT = G.T
+    residuals = []
+    for _ in range(max_iter):
+        # Update authority scores: a = A^T h
+        a_new = _normalize(GT @ h)
+        # Update hub scores: h = A a
+        h_new = _normalize(G @ (a_new if use_fresh else a))
+        residuals.append(max(np.linalg.norm(a_new - a, 2), np.linalg.norm(h_new - h, 2)))
+        a, h = a_new, h_new
+        # If convergence, return
+        if residuals[-1] < e:
+            break
+    return h, a, residuals
+
+def _partition_rows(indptr, num_blocks):
+    """
+    Helper splitting the rows of a CSR matrix into num_blocks contiguous
+    blocks with roughly the same number of non-zeros each.
+    Returns the block boundaries (num_blocks + 1 row indices).
+    """
+    targets = np.linspace(0, indptr[-1], num_blocks + 1)
+    bounds = np.searchsorted(indptr, targets)
+    bounds[0], bounds[-1] = 0, len(indptr) - 1
+    return np.maximum.accumulate(bounds)
+
+def compute_pagerank_parallel(G, d=0.95, e=1e-8, max_iter=100, workers=4, return_iterations=False):
+    """
+    Compute PageRank with the sparse mat-vec split over a thread pool.
+    The in-link matrix (G transposed, so row i lists the pages pointing to i)
+    is cut into row blocks with equal numbers of edges; every iteration each
+    worker computes its block's slice of the new PageRank and its share of
+    the convergence check, and the partial sums are combined before the next
+    iteration. scipy's sparse mat-vec releases the GIL, so threads run the
+    blocks in parallel without copying the score vectors between processes.
+    Same model and scores as compute_pagerank_sparse. Note the in-link blocks
+    are one extra copy of the edge arrays.
+    G:          adjacency matrix (CSR, other sparse format, or dense), G[j, i] != 0 if j points to i
+    d:          damping parameter, set to 0.95 (= 1 makes little difference)
+    e:          epsilon, for quick-stop convergence
+    max_iter:   if we're not converging fast enough, stop after this # iterations
+    workers:    number of threads (and row blocks)
+    return_iterations:  if True, return (PR, number of iterations run)
+    """
+    G = as_csr(G)
+    N = G.shape[0]
+    # Step 1: compute every page's out-degree once, up front
+    inv_degree, dangling = _inverse_out_degree(G)
+    dangling = np.flatnonzero(dangling)
+    # Step 2: split the in-link matrix into row blocks, one per worker
+    GT = G.T.tocsr()
+    bounds = _partition_rows(GT.indptr, workers)
+    blocks = [(lo, hi, GT[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    del GT
+    # Step 3: set the initial PageRank to 1/N for each page
+    PR = np.ones(N) / N
+    new_PR = np.empty(N)
+
+    def update_block(block, weighted_PR, teleport):
+        # new PageRank of this block's pages, and the block's part of the L1 change
+        lo, hi, rows = block
+        new_PR[lo:hi] = d * (rows @ weighted_PR) + teleport
+        return np.abs(new_PR[lo:hi] - PR[lo:hi]).sum()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Step 4: iterate for a maximum number of iterations or until convergence
+        iterations = 0
+        for _ in range(max_iter):
+            iterations += 1
+            weighted_PR = PR * inv_degree
+            teleport = ((1 - d) + d * PR[dangling].sum()) / N
+            # combine the per-block partial sums of the L1 change
+            change = sum(pool.map(lambda block: update_block(block, weighted_PR, teleport), blocks))
+            if change < e:
+                break
+            PR, new_PR = new_PR, PR
+    return (PR, iterations) if return_iterations else PR
+
+def benchmark_parallel_pagerank(G=None, N=1_000_000, num_edges=10_000_000, workers=(1, 2, 4, 8), iterations=20, seed=0):
+    """
+    Measure compute_pagerank_parallel throughput (edges processed per second)
+    at each worker count, on G or on a random graph of N nodes and num_edges edges.
+    Runs a fixed number of iterations (e = 0), so every worker count does the same work.
+    Returns a dict of workers -> edges per second.
+    """
+    if G is None:
+        rng = np.random.default_rng(seed)
+        G = edges_to_csr(rng.integers(0, N, num_edges), rng.integers(0, N, num_edges), N)
+    G = as_csr(G)
+    results = {}
+    for num_workers in workers:
+        start = time.perf_counter()
+        compute_pagerank_parallel(G, e=0, max_iter=iterations, workers=num_workers)
+        elapsed = time.perf_counter() - start
+        results[num_workers] = G.nnz * iterations / elapsed
+        print(f"{num_workers} workers: \t{elapsed:.3f} s \t{results[num_workers] / 1e6:.1f} M edges/s")
+    return results
+
+
+# ++++++++++++++++++ Graph Storage +++++++++++++++++++ #
+def _read_edge_chunks(path, binary_dtype=None, chunk_size=1_000_000):
+    """
+    Generator over (src, dst) array pairs of at most chunk_size edges each.
+    path:           edge list file
+    binary_dtype:   None for a text file with one "src dst" pair per line
+                    (lines starting with # or % are comments), otherwise the
+                    integer dtype of a raw binary file of src,dst,src,dst,...
+    chunk_size:     number of edges read per chunk
+    """
+    if binary_dtype is not None:
+        with open(path, "rb") as f:
+            while True:
+                chunk = np.fromfile(f, dtype=binary_dtype, count=2 * chunk_size)
+                if len(chunk) == 0:
+                    return
+                yield chunk[0::2].astype(np.int64), chunk[1::2].astype(np.int64)
+    with open(path, "rb") as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            lines = [line for line in lines if not line.startswith((b"#", b"%"))]
+            # only the first two columns are used, any extra columns (e.g. weights) are ignored
+            pairs = [line.split()[:2] for line in lines if line.strip()]
+            chunk = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+            yield chunk[:, 0], chunk[:, 1]
+
+def convert_edge_list(path, out_dir, N=None, binary_dtype=None, chunk_size=1_000_000):
+    """
+    Convert an edge list file into an on-disk CSR graph (indptr.npy,
+    indices.npy and data.npy in out_dir), without ever holding the whole
+    edge list in memory. Node ids must be integers in [0, N).
+    Uses two streaming passes (a counting sort by source node):
+    pass 1 counts out-degrees, pass 2 scatters each edge into its row.
+    Duplicate edges are kept, so they act as weighted links.
+    Edge weights are stored as float32 (exact for integer weights up to 2^24),
+    a third of the size of float64 next to int32 indices; scipy's mat-vecs
+    upcast them, so the solvers still compute in float64.
+    path:           edge list file, see _read_edge_chunks for the formats
+    out_dir:        directory to write the .npy files into
+    N:              number of nodes, inferred from the largest id if not given
+    binary_dtype:   None for text input, otherwise dtype of the binary input
+    chunk_size:     number of edges held in memory at once
+    """
+    # Pass 1: count out-degree of every source node (and find N if needed)
+    counts = np.zeros(N or 0, dtype=np.int64)
+    max_id = -1
+    for src, dst in _read_edge_chunks(path, binary_dtype, chunk_size):
+        max_id = max(max_id, int(src.max(initial=-1)), int(dst.max(initial=-1)))
+        chunk_counts = np.bincount(src)
+        if len(chunk_counts) > len(counts):
+            counts = np.concatenate([counts, np.zeros(len(chunk_counts) - len(counts), dtype=np.int64)])
+        counts[:len(chunk_counts)] += chunk_counts
+    N = max(N or 0, max_id + 1)
+    counts = np.concatenate([counts, np.zeros(N - len(counts), dtype=np.int64)])
+    num_edges = int(counts.sum())
+    # int32 indices halve the file size whenever the graph allows it
+    idx_dtype = np.int32 if max(N, num_edges) < 2**31 else np.int64
+    # Step 2: row pointers are the running sum of the out-degrees
+    os.makedirs(out_dir, exist_ok=True)
+    indptr = np.lib.format.open_memmap(os.path.join(out_dir, "indptr.npy"), mode="w+", dtype=idx_dtype, shape=(N + 1,))
+    indptr[0] = 0
+    np.cumsum(counts, out=indptr[1:])
+    # Pass 2: place every edge's destination at the next free slot of its source's row
+    indices = np.lib.format.open_memmap(os.path.join(out_dir, "indices.npy"), mode="w+", dtype=idx_dtype, shape=(num_edges,))
+    fill = np.array(indptr[:-1], dtype=np.int64)
+    for src, dst in _read_edge_chunks(path, binary_dtype, chunk_size):
+        order = np.argsort(src, kind="stable")
+        src, dst = src[order], dst[order]
+        rows, starts, row_counts = np.unique(src, return_index=True, return_counts=True)
+        # rank of each edge within its source's group in this chunk
+        rank = np.arange(len(src)) - np.repeat(starts, row_counts)
+        indices[fill[src] + rank] = dst
+        fill[rows] += row_counts
+    # scipy's CSR needs a data array; storing it lets load_csr map it as well
+    data = np.lib.format.open_memmap(os.path.join(out_dir, "data.npy"), mode="w+", dtype=np.float32, shape=(num_edges,))
+    data[:] = 1.0
+    for arr in (indptr, indices, data):
+        arr.flush()
+    return load_csr(out_dir)
+
+def save_csr(G, out_dir):
+    """
+    Write an in-memory graph (dense or sparse) to out_dir in the same
+    on-disk CSR layout as convert_edge_list (float32 edge weights).
+    """
+    G = as_csr(G)
+    idx_dtype = np.int32 if max(G.shape[0], G.nnz) < 2**31 else np.int64
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "indptr.npy"), G.indptr.astype(idx_dtype))
+    np.save(os.path.join(out_dir, "indices.npy"), G.indices.astype(idx_dtype))
+    np.save(os.path.join(out_dir, "data.npy"), G.data.astype(np.float32))
+
+def load_csr(graph_dir):
+    """
+    Memory-map an on-disk CSR graph written by convert_edge_list or save_csr.
+    Nothing is read up front; pages are pulled in by the OS as the solvers
+    touch them, so both compute_pagerank_sparse and compute_hubsauthorities
+    iterate straight over the mapped files.
+    """
+    indptr = np.load(os.path.join(graph_dir, "indptr.npy"), mmap_mode="r")
+    indices = np.load(os.path.join(graph_dir, "indices.npy"), mmap_mode="r")
+    data = np.load(os.path.join(graph_dir, "data.npy"), mmap_mode="r")
+    N = len(indptr) - 1
+    return sp.csr_matrix((data, indices, indptr), shape=(N, N), copy=False)
+
+def build_adjacency_index(graph_dir, chunk_size=1_000_000):
+    """
+    Add the in-links of an on-disk CSR graph (from convert_edge_list or
+    save_csr) to it, as a second CSR graph of the transpose in
+    graph_dir/in_links, so both the pages a page points to and the pages
+    pointing to it are one row read away (see load_adjacency_index).
+    Same two streaming passes as convert_edge_list, over chunk_size edges
+    of the mapped out-link arrays at a time, so the graph never has to fit
+    in memory.
+    """
+    G = load_csr(graph_dir)
+    N, num_edges = G.shape[0], G.nnz
+    out_dir = os.path.join(graph_dir, "in_links")
+    os.makedirs(out_dir, exist_ok=True)
+    idx_dtype = G.indices.dtype
+    # Pass 1: count in-degree of every node
+    counts = np.zeros(N, dtype=np.int64)
+    for lo in range(0, num_edges, chunk_size):
+        counts += np.bincount(G.indices[lo:lo + chunk_size], minlength=N)
+    indptr = np.lib.format.open_memmap(os.path.join(out_dir, "indptr.npy"), mode="w+", dtype=G.indptr.dtype, shape=(N + 1,))
+    indptr[0] = 0
+    np.cumsum(counts, out=indptr[1:])
+    # Pass 2: place every edge's source at the next free slot of its destination's row
+    indices = np.lib.format.open_memmap(os.path.join(out_dir, "indices.npy"), mode="w+", dtype=idx_dtype, shape=(num_edges,))
+    data = np.lib.format.open_memmap(os.path.join(out_dir, "data.npy"), mode="w+", dtype=G.data.dtype, shape=(num_edges,))
+    fill = np.array(indptr[:-1], dtype=np.int64)
+    for lo in range(0, num_edges, chunk_size):
+        hi = min(lo + chunk_size, num_edges)
+        # source of every edge in the chunk: the row whose range contains it
+        src = np.searchsorted(G.indptr, np.arange(lo, hi), side="right") - 1
+        dst = np.asarray(G.indices[lo:hi])
+        order = np.argsort(dst, kind="stable")
+        src, dst, weights = src[order], dst[order], np.asarray(G.data[lo:hi])[order]
+        rows, starts, row_counts = np.unique(dst, return_index=True, return_counts=True)
+        rank = np.arange(len(dst)) - np.repeat(starts, row_counts)
+        indices[fill[dst] + rank] = src
+        data[fill[dst] + rank] = weights
+        fill[rows] += row_counts
+    for arr in (indptr, indices, data):
+        arr.flush()
+    return load_adjacency_index(graph_dir)
+
+def load_adjacency_index(graph_dir):
+    """
+    Memory-map the out-links and in-links of a graph indexed with
+    build_adjacency_index. Returns (out_links, in_links) CSR matrices:
+    row j of out_links lists the pages j points to, row i of in_links
+    the pages pointing to i.
+    """
+    return load_csr(graph_dir), load_csr(os.path.join(graph_dir, "in_links"))
+
+
+
+# +++++++++++++++ Query-Focused HITS +++++++++++++++ #
+# HITS as run per query: the root set (pages matching the query) is
+# expanded to a base set (the root set, every page a root page points to,
+# and up to max_in_links pages pointing to each root page), and HITS runs
+# on the subgraph the base set induces. Only the root set's rows of the
+# on-disk index are read to expand it, and only the base set's rows to
+# extract the subgraph, so the graph itself never has to fit in memory.
+
+def expand_base_set(out_links, in_links, root, max_in_links=50):
+    """
+    Expand a root set (node ids) to its base set, as sorted unique node ids.
+    max_in_links:   most in-links followed per root page (a popular page can
+                    have millions; like Kleinberg's d, this keeps base sets small)
+    """
+    root = np.unique(np.asarray(root, dtype=np.int64))
+    parts = [root, np.asarray(out_links[root].indices, dtype=np.int64)]
+    for node in root:
+        lo = in_links.indptr[node]
+        hi = min(in_links.indptr[node + 1], lo + max_in_links)
+        parts.append(np.asarray(in_links.indices[lo:hi], dtype=np.int64))
+    return np.unique(np.concatenate(parts))
+
+def extract_subgraph(out_links, nodes):
+    """
+    Subgraph induced by nodes (sorted node ids), as an in-memory CSR matrix
+    whose row/column k is node nodes[k]. Reads only the rows of nodes.
+    """
+    return out_links[nodes][:, nodes].tocsr()
+
+def _graph_bytes(G):
+    """ Memory held by a CSR matrix's arrays. """
+    return G.data.nbytes + G.indices.nbytes + G.indptr.nbytes
+
+def _sample_nodes(nodes, sample_bits=4):
+    """
+    The about 1 in 2^sample_bits nodes whose (multiplicatively hashed) id
+    has its top sample_bits bits clear. The choice depends only on the id,
+    so two base sets sample exactly the same nodes out of the ones they share.
+    """
+    hashed = nodes.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    return nodes[hashed >> np.uint64(64 - sample_bits) == 0]
+
+class QueryHITS:
+    """
+    Query-focused HITS over an on-disk adjacency index, with an LRU cache
+    of base sets: for every recent query, its base set's node ids,
+    extracted subgraph and converged hub/authority weights. The cache is
+    bounded by the memory those arrays take, not by the number of queries.
+    For every query:
+        - a repeated root set, or a new one that expands to a cached base
+          set, returns the cached weights without running HITS at all
+        - otherwise the subgraph is extracted from disk, and HITS is
+          warm-started from the cached base set sharing the most nodes with
+          it (its weights on the shared nodes, a small uniform weight on
+          the new ones), which converges in fewer iterations than from a
+          uniform start when queries overlap. Candidates are found through
+          an index of a hashed sample of every cached base set's nodes, and
+          only the max_candidates sharing the most sampled nodes are
+          intersected exactly, so the lookup does not grow with the cache
+    stats counts hits, warm starts, cold starts and HITS iterations.
+    graph_dir:      graph indexed with build_adjacency_index
+    max_bytes:      memory bound of the cache
+    max_in_links:   see expand_base_set
+    e, max_iter:    see compute_hubsauthorities_sparse
+    min_overlap:    fraction of the new base set a cached one must cover to warm-start from it
+    max_candidates: cached base sets compared exactly per warm start
+    """
+    def __init__(self, graph_dir, max_bytes=256 << 20, max_in_links=50, e=1e-8, max_iter=1000, min_overlap=0.5, max_candidates=4):
+        self.out_links, self.in_links = load_adjacency_index(graph_dir)
+        self.max_bytes = max_bytes
+        self.max_in_links = max_in_links
+        self.e = e
+        self.max_iter = max_iter
+        self.min_overlap = min_overlap
+        self.max_candidates = max_candidates
+        # base set key -> (nodes, subgraph, h, a), least recently used first
+        self.cache = OrderedDict()
+        # root set key -> base set key, for repeated queries
+        self.roots = {}
+        # sampled node id -> keys of the cached base sets containing it (see _sample_nodes)
+        self.node_index = {}
+        self.nbytes = 0
+        self.stats = {"hits": 0, "warm_starts": 0, "cold_starts": 0, "iterations": 0}
+
+    def __len__(self):
+        return len(self.cache)
+
+    def query(self, root):
+        """
+        Hub and authority weights of the base set of root (node ids).
+        Returns (nodes, h, a): the base set's node ids and their weights.
+        """
+        root_key = np.unique(np.asarray(root, dtype=np.int64)).tobytes()
+        key = self.roots.get(root_key)
+        if key not in self.cache:
+            nodes = expand_base_set(self.out_links, self.in_links, np.frombuffer(root_key, dtype=np.int64), self.max_in_links)
+            key = nodes.tobytes()
+            self.roots[root_key] = key
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["hits"] += 1
+            nodes, _, h, a = self.cache[key]
+            return nodes, h, a
+        G = extract_subgraph(self.out_links, nodes)
+        h0, a0 = self._warm_start(nodes)
+        h, a, residuals = compute_hubsauthorities_sparse(G, self.e, self.max_iter, h0=h0, a0=a0)
+        self.stats["iterations"] += len(residuals)
+        self._insert(key, (nodes, G, h, a))
+        return nodes, h, a
+
+    def _warm_start(self, nodes):
+        """ Initial (h0, a0) for base set nodes from the best-overlapping cached base set, or (None, None). """
+        votes = Counter()
+        for node in _sample_nodes(nodes).tolist():
+            votes.update(self.node_index.get(node, ()))
+        best, best_shared = None, self.min_overlap * len(nodes)
+        for key, _ in votes.most_common(self.max_candidates):
+            cached_nodes, _, h, a = self.cache[key]
+            shared = np.intersect1d(nodes, cached_nodes, assume_unique=True)
+            if len(shared) > best_shared:
+                best, best_shared = (cached_nodes, h, a, shared), len(shared)
+        if best is None:
+            self.stats["cold_starts"] += 1
+            return None, None
+        self.stats["warm_starts"] += 1
+        cached_nodes, h, a, shared = best
+        # new nodes start at a small uniform weight, so every node can still gain weight
+        h0 = np.full(len(nodes), 1e-3 / np.sqrt(len(nodes)))
+        a0 = h0.copy()
+        h0[np.searchsorted(nodes, shared)] += h[np.searchsorted(cached_nodes, shared)]
+        a0[np.searchsorted(nodes, shared)] += a[np.searchsorted(cached_nodes, shared)]
+        return h0, a0
+
+    def _insert(self, key, entry):
+        """ Add a base set to the cache, evicting least recently used ones until it fits in max_bytes. """
+        nodes, G, h, a = entry
+        size = nodes.nbytes + _graph_bytes(G) + h.nbytes + a.nbytes + len(key)
+        if size > self.max_bytes:
+            return
+        self.cache[key] = entry
+        self.nbytes += size
+        for node in _sample_nodes(nodes).tolist():
+            self.node_index.setdefault(node, set()).add(key)
+        while self.nbytes > self.max_bytes:
+            old_key, (old_nodes, old_G, old_h, old_a) = self.cache.popitem(last=False)
+            self.nbytes -= old_nodes.nbytes + _graph_bytes(old_G) + old_h.nbytes + old_a.nbytes + len(old_key)
+            for node in _sample_nodes(old_nodes).tolist():
+                keys = self.node_index[node]
+                keys.discard(old_key)
+                if not keys:
+                    del self.node_index[node]
+        # forget root sets whose base set was evicted
+        self.roots = {root_key: key for root_key, key in self.roots.items() if key in self.cache}
+
+
+
 # +++++++++++++++++++ Main Functions +++++++++++++++++++ #
 
 if __name__ == "__main__":
     pagerank_scores = compute_pagerank(A)
     print("PageRank Scores:", pagerank_scores)
+    sparse_pagerank_scores = compute_pagerank_sparse(edges_to_csr(*np.nonzero(A), N=A.shape[0]))
+    print("Sparse PageRank Scores:", sparse_pagerank_scores)
     hub_weights, authority_weights = compute_hubsauthorities(A)
     print(f"\nHub Weights: {hub_weights}")
     print(f"\nAuthority weights: {authority_weights}")
\ No newline at end of file
@@ -12,23 +12,34 @@ real interval [0, 1] as broken up into subintervals
 """
 
 # +++++++++++++++++ Installs/Imports +++++++++++++++++ #
+import io
+import time
 import random 
 import math
+from bisect import bisect_right
 
 
 
 # ++++++++++++++++++++ Functions +++++++++++++++++++++ #
 
 def arithmetic_encoding(str_to_encode, probs, chars):
+    # index of each char and where its probability range starts (the same at every level, so only once)
+    char_indices = {char: i for i, char in enumerate(chars)}
+    window_starts = []
+    start = 0
+    for prob in probs:
+        window_starts.append(start)
+        start += prob
+
     # original window that we focus on
     window = [0, 1]  
     for i, char in enumerate(str_to_encode):
         # find index of char so that we compute window there
-        char_index = chars.index(char)
+        char_index = char_indices[char]
         window_length = window[1] - window[0]
         # compute start for however many levels we've gone down so far
-        start = window[0] + sum(window_length * probs[i] for i in range(char_index))
-        eq0 = " + ".join(f"{window_length:.5f} * {probs[i]}" for i in range(char_index))
+        start = window[0] + window_length * window_starts[char_index]
+        eq0 = " + ".join(f"{window_length:.5f} * {probs[j]}" for j in range(char_index))
         eq1 = f"{window[0]:.5f}" + (f" + {eq0}" if eq0 else "")
         tabs = f"\t" if eq0 else f"\t\t\t"
         # the end is simply where we start times the 'width'/prob of that range
@@ -37,34 +48,426 @@ def arithmetic_encoding(str_to_encode, probs, chars):
         eq2 = f"{start:.5f} + {window_length:.5f} * {probs[char_index]}"
         # update window to this new location
         window = [start, end]
-        print(f"Step {i}, Window For {char}: [{"{:.6f}".format(window[0])},{"{:.5f}".format(window[1])}]")
+        print(f"Step {i}, Window For {char}: [{window[0]:.6f},{window[1]:.5f}]")
         print(f"Start Window: {eq1}")
         print(f"End Window: {eq2}\n\n")
     return random.uniform(window[0], window[1])
 
 def arithmetic_decoding(val_to_decode, num_levels, probs, chars, decoded_str=""):
-    # if done with recursion, return the value
-    if num_levels == 0:
-        return decoded_str
-
-    # compute probability ranges for this level
-    sub_windows = {}
+    # compute probability ranges (the same at every level, so only once)
+    window_starts = []
     start = 0
-    for char, prob in zip(chars, probs):
-        sub_windows[char] = (start, start + prob)
+    for prob in probs:
+        window_starts.append(start)
         start += prob
 
-    # identify what character we should append at this level based on sub_windows and val_to_decode
-    for char, (window_start, window_end) in sub_windows.items():
-        if window_start <= val_to_decode < window_end:
-            # if the value is in one of the sub_windows...
-            # normalize value to be within the new selected range, and continue on!
-            new_encoded_val = (val_to_decode - window_start) / (window_end - window_start)
-            eq1 = f"({val_to_decode:.5f} - {window_start}) / ({window_end} - {window_start}) = {new_encoded_val:.5f}"
+    # one level per decoded character (a loop, so long inputs don't hit the recursion limit)
+    while num_levels > 0:
+        # identify what character we should append at this level based on the windows and val_to_decode
+        # (binary search over the window starts instead of scanning every window)
+        char_index = bisect_right(window_starts, val_to_decode) - 1
+        if char_index < 0 or val_to_decode >= window_starts[char_index] + probs[char_index]:
+            # value fell outside every window (e.g. float rounding pushed it to 1.0)
+            return None
+        char = chars[char_index]
+        window_start, window_end = window_starts[char_index], window_starts[char_index] + probs[char_index]
+        # if the value is in one of the sub_windows...
+        # normalize value to be within the new selected range, and continue on!
+        new_encoded_val = (val_to_decode - window_start) / (window_end - window_start)
+        eq1 = f"({val_to_decode:.5f} - {window_start}) / ({window_end} - {window_start}) = {new_encoded_val:.5f}"
+
+        print(f"Level {num_levels} \tValue {val_to_decode:.10f} \tChar {char} With Window [{window_start},{window_end}) \tString {decoded_str+char}")
+        print(f"Level {num_levels} \tNext Level's Value \t{eq1}\n")
+        val_to_decode, decoded_str = new_encoded_val, decoded_str + char
+        num_levels -= 1
+    return decoded_str
+
+
+
+# ++++++++++++++++ Integer Range Coder ++++++++++++++++ #
+# Fixed-precision integer arithmetic coder (Witten, Neal & Cleary style).
+# Unlike the float version above it works for inputs of any length: the
+# [low, high] window is kept as 32-bit integers and renormalized (doubled)
+# whenever its leading bit is settled, emitting that bit. When the window
+# straddles the midpoint too tightly, the undecided bits are counted as
+# "pending" and emitted once the next settled bit is known (the carry).
+
+PRECISION = 32
+FULL = (1 << PRECISION) - 1
+HALF = 1 << (PRECISION - 1)
+QUARTER = 1 << (PRECISION - 2)
+# frequency totals must stay well below QUARTER so no symbol's range can shrink to zero
+MAX_TOTAL = 1 << 24
+# models with a total up to this size decode through a direct target -> symbol table
+LOOKUP_TABLE_SIZE = 1 << 16
+
+def integer_frequencies(probs, chars, total=LOOKUP_TABLE_SIZE):
+    """
+    Turn the probs/chars model into integer cumulative frequencies.
+    Every char gets a frequency of at least 1, and an extra end-of-stream
+    symbol (index len(chars), frequency 1) is appended so the decoder knows
+    where the input stops without being told its length.
+    total:  target frequency total (raised if the alphabet needs more room)
+    Returns the cumulative table cum, where symbol i owns [cum[i], cum[i+1]).
+    """
+    scale = max(total, 4 * (len(chars) + 1)) - len(chars) - 1
+    freqs = [max(1, round(prob * scale)) for prob in probs] + [1]
+    cum = [0]
+    for freq in freqs:
+        cum.append(cum[-1] + freq)
+    if cum[-1] > MAX_TOTAL:
+        raise ValueError(f"alphabet too large: total frequency {cum[-1]} > {MAX_TOTAL}")
+    return cum
+
+class FrequencyModel:
+    """
+    Static model for the integer range coder, precomputed once from probs/chars
+    so that every per-symbol operation costs the same however large the alphabet:
+    encoding looks a symbol up in a dict, decoding maps a target frequency to
+    a symbol through a direct lookup table (small totals) or a binary search
+    over the cumulative frequencies (large totals).
+    Symbols are handled as indices into chars; index len(chars) is end-of-stream.
+    The range coder only uses total, lookup, symbol_range, find and update,
+    so adaptive models can implement the same methods.
+    probs:  probability of each char
+    chars:  the alphabet (any hashable symbols)
+    """
+    def __init__(self, probs, chars):
+        self.chars = list(chars)
+        self.eof = len(self.chars)
+        self.cum = integer_frequencies(probs, self.chars)
+        self.total = self.cum[-1]
+        self.index = {char: i for i, char in enumerate(self.chars)}
+        self.table = None
+        if self.total <= LOOKUP_TABLE_SIZE:
+            self.table = [i for i in range(len(self.cum) - 1) for _ in range(self.cum[i + 1] - self.cum[i])]
+
+    def lookup(self, symbol):
+        """ Index of a symbol, O(1). """
+        return self.index[symbol]
+
+    def symbol_range(self, index):
+        """ [low, high) cumulative frequencies of symbol index. """
+        return self.cum[index], self.cum[index + 1]
+
+    def find(self, target):
+        """ Index of the symbol whose range contains target, O(1) or O(log alphabet). """
+        if self.table is not None:
+            return self.table[target]
+        return bisect_right(self.cum, target) - 1
+
+    def update(self, index):
+        """ Static model: nothing to learn. """
+
+class FenwickTree:
+    """
+    Binary indexed tree over n non-negative counts: point updates, prefix
+    sums and "which index holds cumulative position target" are all O(log n).
+    """
+    def __init__(self, counts):
+        self.n = len(counts)
+        self.tree = [0] + list(counts)
+        # O(n) build: push every node's sum up to its parent
+        for i in range(1, self.n + 1):
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+        self.top_bit = 1 << (self.n.bit_length() - 1)
+
+    def add(self, index, delta):
+        """ counts[index] += delta """
+        i = index + 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index):
+        """ Sum of counts[0:index]. """
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, target):
+        """ Index i with prefix(i) <= target < prefix(i + 1), by descending the tree. """
+        index = 0
+        step = self.top_bit
+        while step:
+            if index + step <= self.n and self.tree[index + step] <= target:
+                index += step
+                target -= self.tree[index]
+            step >>= 1
+        return index
+
+class AdaptiveModel:
+    """
+    Adaptive model for the integer range coder: symbol counts start at 1 and
+    grow as symbols are coded, so no probabilities need to be known (or sent)
+    up front. With order k > 0 the counts are kept separately for every
+    context of the previous k symbols. Counts live in Fenwick trees, so each
+    update and each cumulative lookup is O(log alphabet).
+    Encoder and decoder each build their own AdaptiveModel with the same
+    arguments; they stay in sync because both update after every symbol.
+    chars:      the alphabet (any hashable symbols)
+    order:      number of previous symbols used as context (0 = plain adaptive)
+    increment:  count added per occurrence (bigger adapts faster)
+    max_total:  once a context's total passes this, its counts are halved,
+                which keeps totals bounded and lets old statistics fade
+    """
+    def __init__(self, chars, order=0, increment=32, max_total=1 << 16):
+        self.chars = list(chars)
+        self.eof = len(self.chars)
+        self.index = {char: i for i, char in enumerate(self.chars)}
+        self.order = order
+        self.increment = increment
+        self.max_total = min(max_total, MAX_TOTAL)
+        self.contexts = {}
+        self.history = ()
+        self._select_context()
+
+    def _select_context(self):
+        # counts and tree of the current context, created on first use
+        if self.history not in self.contexts:
+            counts = [1] * (self.eof + 1)
+            self.contexts[self.history] = [counts, FenwickTree(counts), len(counts)]
+        self.counts, self.tree, self.total = self.contexts[self.history]
+
+    def lookup(self, symbol):
+        """ Index of a symbol, O(1). """
+        return self.index[symbol]
+
+    def symbol_range(self, index):
+        """ [low, high) cumulative counts of symbol index in the current context. """
+        low = self.tree.prefix(index)
+        return low, low + self.counts[index]
+
+    def find(self, target):
+        """ Index of the symbol whose range contains target, O(log alphabet). """
+        return self.tree.find(target)
+
+    def update(self, index):
+        """ Count one more occurrence of index, then move to the next context. """
+        context = self.contexts[self.history]
+        self.counts[index] += self.increment
+        self.tree.add(index, self.increment)
+        context[2] += self.increment
+        if context[2] > self.max_total:
+            # halve every count (keeping them >= 1) and rebuild the tree
+            context[0] = [(count + 1) // 2 for count in self.counts]
+            context[1] = FenwickTree(context[0])
+            context[2] = sum(context[0])
+        if self.order:
+            self.history = (self.history + (index,))[-self.order:]
+        self._select_context()
+
+class _BitWriter:
+    """
+    Packs bits into bytes and writes them to out in chunks of flush_size bytes.
+    """
+    def __init__(self, out, flush_size=1 << 16):
+        self.out = out
+        self.flush_size = flush_size
+        self.buffer = bytearray()
+        self.byte = 0
+        self.num_bits = 0
+        self.bytes_written = 0
+
+    def write(self, bit, repeat=1):
+        for _ in range(repeat):
+            self.byte = (self.byte << 1) | bit
+            self.num_bits += 1
+            if self.num_bits == 8:
+                self.buffer.append(self.byte)
+                self.byte = 0
+                self.num_bits = 0
+                if len(self.buffer) >= self.flush_size:
+                    self.flush()
+
+    def flush(self, final=False):
+        # on the final flush, pad the last partial byte with zeros
+        if final and self.num_bits:
+            self.buffer.append(self.byte << (8 - self.num_bits))
+            self.byte = 0
+            self.num_bits = 0
+        self.out.write(bytes(self.buffer))
+        self.bytes_written += len(self.buffer)
+        self.buffer.clear()
+
+def _read_bits(inp, chunk_size=1 << 16):
+    """
+    Generator over the bits of a binary stream, read chunk_size bytes at a
+    time, followed by zeros forever (the encoder's implicit padding).
+    """
+    while True:
+        chunk = inp.read(chunk_size)
+        if not chunk:
+            break
+        for byte in chunk:
+            for shift in range(7, -1, -1):
+                yield (byte >> shift) & 1
+    while True:
+        yield 0
+
+def range_encode(symbols, probs, chars, out, model=None):
+    """
+    Encode an iterable of symbols with the integer arithmetic coder,
+    writing bytes to the binary stream out as they are produced, so memory
+    stays constant however long the input is (symbols can be a generator).
+    symbols:    iterable of entries of chars
+    probs:      probability of each char (same model as arithmetic_encoding)
+    chars:      the alphabet
+    out:        binary file-like object with a write method
+    model:      prebuilt model (e.g. a FrequencyModel), used instead of probs/chars
+    Returns the number of bytes written.
+    """
+    model = FrequencyModel(probs, chars) if model is None else model
+    writer = _BitWriter(out)
+    low, high, pending = 0, FULL, 0
+
+    def encode_symbol(index):
+        nonlocal low, high, pending
+        # narrow the window to the symbol's share of it
+        window_length = high - low + 1
+        symbol_low, symbol_high = model.symbol_range(index)
+        high = low + window_length * symbol_high // model.total - 1
+        low = low + window_length * symbol_low // model.total
+        model.update(index)
+        # renormalize: shift out every leading bit that low and high agree on
+        while True:
+            if high < HALF:
+                writer.write(0)
+                writer.write(1, pending)
+                pending = 0
+            elif low >= HALF:
+                writer.write(1)
+                writer.write(0, pending)
+                pending = 0
+                low -= HALF
+                high -= HALF
+            elif low >= QUARTER and high < 3 * QUARTER:
+                # window straddles the middle: the next bit is undecided, remember it
+                pending += 1
+                low -= QUARTER
+                high -= QUARTER
+            else:
+                break
+            low = 2 * low
+            high = 2 * high + 1
+
+    for symbol in symbols:
+        encode_symbol(model.lookup(symbol))
+    # end-of-stream symbol, then enough bits to pin a value inside the final window
+    encode_symbol(model.eof)
+    pending += 1
+    if low < QUARTER:
+        writer.write(0)
+        writer.write(1, pending)
+    else:
+        writer.write(1)
+        writer.write(0, pending)
+    writer.flush(final=True)
+    return writer.bytes_written
+
+def range_decode(inp, probs, chars, model=None):
+    """
+    Decode a stream written by range_encode, reading bytes from the binary
+    stream inp as needed. Generator yielding the decoded symbols one at a
+    time, until the end-of-stream symbol.
+    model:      prebuilt model, must start in the same state as the encoder's
+    """
+    model = FrequencyModel(probs, chars) if model is None else model
+    bits = _read_bits(inp)
+    low, high, value = 0, FULL, 0
+    for _ in range(PRECISION):
+        value = 2 * value + next(bits)
+    while True:
+        # find the symbol whose share of the window contains value
+        window_length = high - low + 1
+        target = ((value - low + 1) * model.total - 1) // window_length
+        index = model.find(target)
+        if index == model.eof:
+            return
+        yield model.chars[index]
+        # narrow the window exactly like the encoder did, and follow its renormalization
+        symbol_low, symbol_high = model.symbol_range(index)
+        high = low + window_length * symbol_high // model.total - 1
+        low = low + window_length * symbol_low // model.total
+        model.update(index)
+        while True:
+            if high < HALF:
+                pass
+            elif low >= HALF:
+                value -= HALF
+                low -= HALF
+                high -= HALF
+            elif low >= QUARTER and high < 3 * QUARTER:
+                value -= QUARTER
+                low -= QUARTER
+                high -= QUARTER
+            else:
+                break
+            low = 2 * low
+            high = 2 * high + 1
+            value = 2 * value + next(bits)
+
+def encode_stream(inp, out, probs, chars, chunk_size=1 << 16):
+    """
+    Encode a whole file (binary or text mode) with range_encode, reading it
+    chunk_size at a time. For binary files the symbols are byte values, so
+    chars should be ints.
+    Returns the number of bytes written.
+    """
+    def symbols():
+        while True:
+            chunk = inp.read(chunk_size)
+            if not chunk:
+                return
+            yield from chunk
+    return range_encode(symbols(), probs, chars, out)
+
+def decode_stream(inp, out, probs, chars, chunk_size=1 << 16):
+    """
+    Decode a stream written by encode_stream into out (binary if chars are
+    byte values, text if chars are strings), writing chunk_size symbols at a time.
+    Returns the number of symbols decoded.
+    """
+    join = bytes if isinstance(chars[0], int) else "".join
+    buffer = []
+    count = 0
+    for symbol in range_decode(inp, probs, chars):
+        buffer.append(symbol)
+        if len(buffer) >= chunk_size:
+            out.write(join(buffer))
+            count += len(buffer)
+            buffer.clear()
+    out.write(join(buffer))
+    return count + len(buffer)
 
-            print(f"Level {num_levels} \tValue {val_to_decode:.10f} \tChar {char} With Window [{window_start},{window_end}) \tString {decoded_str+char}")
-            print(f"Level {num_levels} \tNext Level's Value \t{eq1}\n")
-            return arithmetic_decoding(new_encoded_val, num_levels - 1, probs, chars, decoded_str + char)
+def benchmark_models(data, orders=(0, 1, 2)):
+    """
+    Compress data (bytes) with the static model, built from the data's own
+    byte frequencies (the best any fixed probs can do, and not counting the
+    cost of sending them), and with adaptive models of each order.
+    Prints and returns, per model, the compression ratio (input / output
+    size) and the encode throughput in MB/s.
+    """
+    chars = list(range(256))
+    counts = [0] * 256
+    for byte in data:
+        counts[byte] += 1
+    models = {"static": FrequencyModel([count / len(data) for count in counts], chars)}
+    for order in orders:
+        models[f"adaptive order-{order}"] = AdaptiveModel(chars, order)
+    results = {}
+    for name, model in models.items():
+        out = io.BytesIO()
+        start = time.perf_counter()
+        num_bytes = range_encode(data, None, None, out, model=model)
+        elapsed = time.perf_counter() - start
+        results[name] = {"ratio": len(data) / num_bytes, "mb_per_s": len(data) / elapsed / 1e6}
+        print(f"{name:<18} ratio {results[name]['ratio']:.3f} \t{results[name]['mb_per_s']:.3f} MB/s")
+    return results
 
 
 # +++++++++++++++++++ Main Function +++++++++++++++++++ #
@@ -77,4 +480,8 @@ if __name__ == "__main__":
     print(f"Encoding {str_to_encode}...")
     print(arithmetic_encoding(str_to_encode, probs, chars)) # we find values between [0.23, 0.26 to be sufficient]
     print(f"\nDecoding {str_to_decode}...")
-    print(arithmetic_decoding(str_to_decode, 10, probs, chars))
\ No newline at end of file
+    print(arithmetic_decoding(str_to_decode, 10, probs, chars))
+    encoded = io.BytesIO()
+    num_bytes = range_encode(str_to_encode, probs, chars, encoded)
+    print(f"\nInteger range coder: {str_to_encode} -> {encoded.getvalue().hex()} ({num_bytes} bytes)")
+    print("Decoded:", "".join(range_decode(io.BytesIO(encoded.getvalue()), probs, chars)))
\ No newline at end of file
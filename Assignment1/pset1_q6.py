@@ -9,20 +9,30 @@ the dictionary in alphabetical order.
 """
 
 # +++++++++++++++++ Installs/Imports +++++++++++++++++ #
- 
+import os
+import time
+import zlib
+import struct
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import random
+import tracemalloc
 
 
 # ++++++++++++++++++++ Functions +++++++++++++++++++++ #
 
-def find_longest_match_search_buffer(search_buffer, lookahead_buffer):
+def find_longest_match_search_buffer(search_buffer, lookahead_buffer, verbose=False):
     """ 
     Helper function for LZ77 compression.
     Finds longest prefix match in lookahead buffer with search buffer. 
     Output: (pos, length) of this prefix in the search buffer.
     If no match, returns (-1, -1).
+    verbose: print the buffers on every call
     """
     # Start with longest prefix in lookahead buffer, and continue shortening it
-    print(search_buffer, " ", lookahead_buffer)
+    if verbose:
+        print(search_buffer, " ", lookahead_buffer)
     for length in range(len(lookahead_buffer), 0, -1):
         # See if the prefix exists in the search buffer
         prefix = lookahead_buffer[:length]
@@ -34,7 +44,7 @@ def find_longest_match_search_buffer(search_buffer, lookahead_buffer):
     # If no match then return invalid values
     return -1, -1, ""
 
-def compress_LZ77(value, search_buffer_size, lookahead_buffer_size):
+def compress_LZ77(value, search_buffer_size, lookahead_buffer_size, verbose=False):
     """ 
     Perform LZ77 compression.
     See tutorial:
@@ -58,6 +68,8 @@ def compress_LZ77(value, search_buffer_size, lookahead_buffer_size):
     Lookahead buffer: [A, B, A]
     Longest prefix-match in search buffer: 'A', starts 2 chars back from curr char
     Output: (2, 1, 'A')
+
+    verbose: print the buffers and matches at every step
     """
 
     # Define variables
@@ -65,11 +77,12 @@ def compress_LZ77(value, search_buffer_size, lookahead_buffer_size):
     search_buffer = "" 
     lookahead_buffer = value[:lookahead_buffer_size] if len(value) > lookahead_buffer_size else value
     char_index = 0 # what value are we currently looking at
-    print(value)
+    if verbose:
+        print(value)
 
     while char_index < len(value) and lookahead_buffer != "":
         # Find the longest match
-        pos, length, prefix = find_longest_match_search_buffer(search_buffer, lookahead_buffer)
+        pos, length, prefix = find_longest_match_search_buffer(search_buffer, lookahead_buffer, verbose)
         # If match exists...
         if pos != -1:
             # Step 1: create output
@@ -78,7 +91,8 @@ def compress_LZ77(value, search_buffer_size, lookahead_buffer_size):
             # find the next character AFTER the matched prefix
             next_char_index = char_index + length  # Index of the next character
             next_char = value[next_char_index] if next_char_index < len(value) else '' 
-            print("next", char_index, length, next_char)
+            if verbose:
+                print("next", char_index, length, next_char)
             curr_output = (offset, length, next_char)
             output.append(curr_output)
                 
@@ -93,10 +107,11 @@ def compress_LZ77(value, search_buffer_size, lookahead_buffer_size):
             # Either add so we get lookahead_buf_size # of values or add remaining chars
             lookahead_buffer = lookahead_buffer[length+1:] # length+1 for prefix+new character
             char_index = char_index + length + 1            # update the char_index to reflect the match length
-            i = char_index                                  # add each new char one by one
-            while len(lookahead_buffer) < lookahead_buffer_size and i + lookahead_buffer_size <= len(value):
-                print("adding...", char_index+lookahead_buffer_size, value[char_index], value[char_index+lookahead_buffer_size])
-                lookahead_buffer += value[char_index+lookahead_buffer_size]
+            i = char_index + len(lookahead_buffer)          # add each new char one by one, starting after the buffer
+            while len(lookahead_buffer) < lookahead_buffer_size and i < len(value):
+                if verbose:
+                    print("adding...", i, value[i])
+                lookahead_buffer += value[i]
                 i += 1
 
         # If match does not exist...
@@ -120,25 +135,128 @@ def compress_LZ77(value, search_buffer_size, lookahead_buffer_size):
 
 
 
-# ++++++++++++++++++++ Functions +++++++++++++++++++++ #
+def _match_length(data, candidate, pos, limit):
+    """
+    Helper for compress_LZ77_fast: length of the common prefix of
+    data[candidate:] and data[pos:], capped at limit.
+    Binary search over slice comparisons, so the byte comparisons run in C.
+    """
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if data[candidate:candidate + mid] == data[pos:pos + mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
 
-def find_longest_match_dict(dictionary, lookahead_buffer):
+def compress_LZ77_fast(value, window_size=32768, lookahead_buffer_size=258, min_match=3, max_chain=16, nice_length=64, lazy=False, verbose=False, preset=None):
     """
-    Helper function for LZ78 compression.
-    Finds the longest match of the prefix in the dictionary.
-    Returns (index, length) of this match in the dictionary.
-    If no match, returns (-1, -1)
+    LZ77 compression with a hash-chain match finder, for real window sizes.
+    Produces the same (offset, length, next char) tokens as compress_LZ77,
+    except that next char is a length-0 or length-1 slice of value (so
+    bytes input gives bytes, str input gives str), and matches may run
+    past the current position (overlapping copies, as in DEFLATE).
+
+    How it works:
+    Instead of searching the whole window for every prefix, every position
+    is indexed by its next min_match symbols: head maps those symbols to the
+    most recent position that starts with them, and prev links each position
+    to the previous one with the same symbols (a chain, kept only for the
+    last window_size positions). Finding a match walks at most max_chain
+    candidates of the chain, newest first, and stops at the window edge or
+    once a match of nice_length is found.
+    With lazy matching, a match shorter than nice_length is only taken if the
+    next position does not start a match at least 2 longer; otherwise the
+    current char is emitted as a literal. (A literal costs a whole token in
+    this format, so it only pays off for a clearly longer match, which is
+    also why lazy matching is off by default.)
+
+    value:                  bytes, bytearray, memoryview or str to compress
+    window_size:            how far back matches may start (search buffer size)
+    lookahead_buffer_size:  longest match length
+    min_match:              shorter matches are emitted as literals
+    max_chain:              most candidates tried per position
+    nice_length:            match length that is good enough to stop searching (and skip lazy matching)
+    lazy:                   use lazy matching
+    verbose:                print every token
+    preset:                 preset dictionary (same type as value): history that
+                            matches may refer back into, as if value continued it
+                            (decompress_LZ77 must use the same preset)
     """
-    # Start with longest prefix in lookahead buffer, and continue shortening it
-    # Once we find a match, return that dictionary's index and length of prefix
-    for length in range(len(lookahead_buffer), 0, -1):
-        prefix = lookahead_buffer[:length]
-        for index, entry in dictionary.items():
-            if entry == prefix:
-                return index, length
-    return -1, -1
+    # data slices are used as hash keys, so mutable buffers are copied to bytes first
+    data = bytes(value) if isinstance(value, (bytearray, memoryview)) else value
+    start = len(preset) if preset else 0
+    if start:
+        data = (bytes(preset) if isinstance(preset, (bytearray, memoryview)) else preset) + data
+    n = len(data)
+    head = {}
+    prev = [-1] * window_size
+    output = []
+    inserted = 0    # every position before this one is already in the hash chains
+
+    def insert_until(end):
+        # add positions [inserted, end) to the hash chains
+        nonlocal inserted
+        for j in range(inserted, min(end, n - min_match + 1)):
+            key = data[j:j + min_match]
+            prev[j % window_size] = head.get(key, -1)
+            head[key] = j
+        inserted = max(inserted, end)
+
+    def longest_match(pos):
+        # walk the hash chain of pos, returning the best (offset, length)
+        insert_until(pos)
+        limit = min(lookahead_buffer_size, n - pos)
+        best_offset, best_length = 0, 0
+        if limit < min_match:
+            return best_offset, best_length
+        candidate = head.get(data[pos:pos + min_match], -1)
+        for _ in range(max_chain):
+            if candidate < 0 or pos - candidate > window_size:
+                break
+            # a candidate only matters if it beats the best so far, i.e. matches one symbol further:
+            # a single slice comparison rejects the rest, only improvers get their full length measured
+            length = best_length + 1
+            if data[candidate:candidate + length] == data[pos:pos + length]:
+                length += _match_length(data, candidate + length, pos + length, limit - length)
+                best_offset, best_length = pos - candidate, length
+                if length >= nice_length or length == limit:
+                    break
+            candidate = prev[candidate % window_size]
+        return best_offset, best_length
+
+    pos = start
+    match = longest_match(pos)
+    while pos < n:
+        offset, length = match
+        if min_match <= length < nice_length and lazy and pos + 1 < n:
+            # lazy matching: if the next position starts a clearly longer match, emit a literal instead
+            next_match = longest_match(pos + 1)
+            if next_match[1] > length + 1:
+                token = (0, 0, data[pos:pos + 1])
+                output.append(token)
+                if verbose:
+                    print(pos, token)
+                pos += 1
+                match = next_match
+                continue
+        if length < min_match:
+            offset, length = 0, 0
+        token = (offset, length, data[pos + length:pos + length + 1])
+        output.append(token)
+        if verbose:
+            print(pos, token)
+        pos += length + 1
+        if pos < n:
+            match = longest_match(pos)
+    return output
+
+
 
-def compress_LZ78(value, lookahead_buffer_size):
+# ++++++++++++++++++++ Functions +++++++++++++++++++++ #
+
+def compress_LZ78(value, lookahead_buffer_size=None, max_dict_size=None, preset=None):
     """ 
     Perform LZ78 compression.
     Example:
@@ -147,77 +265,780 @@ def compress_LZ78(value, lookahead_buffer_size):
     How it compares to LZ77:
     Very similar, but instead of using a sliding window, we use a dictionary
     Output: list of tuples, where each is (dict index, next char in dict)
+
+    The dictionary is stored as a trie: a hash map from (parent index, char)
+    to the index of the entry parent + char (index 0 is the empty string).
+    Every entry is some earlier entry plus one char, so the longest match is
+    found by walking the trie one input char at a time: O(1) work per char,
+    instead of comparing every prefix against every dictionary entry.
+
+    value:                  str or bytes to compress (bytes give bytes chars)
+    lookahead_buffer_size:  unused, the match may run to the end of value
+    max_dict_size:          once the dictionary holds this many entries it is
+                            reset to empty (decompress_LZ78 must use the same value)
+    preset:                 preset dictionary (same type as value): the dictionary
+                            starts with the entries compressing preset would create
+                            (decompress_LZ78 must use the same preset)
     """
-        
+
     # Define variables
     output = []                 # list of tuples (dict index, next char in dict)
-    dictionary = {}             # 'dict' of substrings (keys = indices starting at 1)
-    lookahead_buffer = value    # initialize with value, update to relevant part as we go
-    char_index = 0              # what char we're looking at (start at 0)
-
-    # While we're not yet at the end of the value string...
-    while char_index < len(value): 
-        # Find the longest match in the dictionary
-        index, length = find_longest_match_dict(dictionary, lookahead_buffer)
-        # If we found a match...
-        if index != -1:
-            # Step 1: create output (index, next character)
-            next_char = lookahead_buffer[length] if length < len(lookahead_buffer) else ''
-            curr_output = (index, next_char)
-            output.append(curr_output)
-            # Step 2: update dict
-            # add the matched prefix + next char to the dictionary
-            new_key = len(dictionary) + 1
-            dictionary[new_key] = lookahead_buffer[:length + 1]
-            # Step 3: Update the lookahead buffer (advance by the matched length + 1)
-            lookahead_buffer = lookahead_buffer[length + 1:]
-            char_index += length + 1
-        # If no match found...
-        else:
-            # Step 1: create output (0, curr character)
-            next_char = lookahead_buffer[0]
-            curr_output = (0, next_char)
-            output.append(curr_output)
-            # Step 2: Update the dictionary (add the current character)
-            new_key = len(dictionary) + 1
-            dictionary[new_key] = next_char
-            # Step 3: move lookahead buffer forward by 1
-            lookahead_buffer = lookahead_buffer[1:]
-            char_index += 1
+    trie = {}                   # (parent index, char) -> index (indices start at 1)
+    code = 0                    # trie node of the match so far (0 = empty string)
+    start = len(preset) if preset else 0
+    if start:
+        value = preset + value
+        if len(value) == start:
+            return output
+
+    # Walk the trie one char at a time
+    for i in range(len(value)):
+        if i == start:
+            # end of the preset: drop its tokens and any unfinished match
+            del output[:]
+            code = 0
+        char = value[i]
+        child = trie.get((code, char))
+        # If the match can be extended by this char, keep walking
+        if child is not None:
+            code = child
+            continue
+        # Otherwise output (index of the match, this char) and add match + char to the dictionary
+        output.append((code, value[i:i + 1]))
+        trie[(code, char)] = len(trie) + 1
+        code = 0
+        if max_dict_size is not None and len(trie) >= max_dict_size:
+            trie.clear()
+    # Input ended in the middle of a match: output it with no next char
+    if code != 0:
+        output.append((code, value[:0]))
     return output
 
-def compress_LZW(value):
+def compress_LZW(value, table=None, max_table_size=None, preset=None):
     """
     LZW compression algorithm.
     Source:
     https://www.geeksforgeeks.org/lzw-lempel-ziv-welch-compression-technique/
+    The table is stored as a trie: a hash map from (code of p, c) to the code
+    of p + c, so "is p + c in the table" and "what is p's code" are O(1).
+    table:          initial single-character entries, defaults to a, b, c, d, r
+                    (for bytes input, use byte values, e.g. range(256));
+                    the decoder must start from the same table
+    max_table_size: once the table is full it is reset to the initial entries
+                    (decompress_LZW must use the same value)
+    preset:         preset dictionary (same type as value): the table starts with
+                    the entries compressing preset + value would create, with the
+                    match cut at the end of preset (decompress_LZW must use the same preset)
     """
 
     # Define variables
     # Initialize table with predefined single-character entries
     # let index i represent each value, starting at i=0
     # output made as list of numbers to allow for discrepancy (ex. 1, 0, and 10)
-    table = ["a", "b", "c", "d", "r"]
+    initial = {char: i for i, char in enumerate(["a", "b", "c", "d", "r"] if table is None else table)}
+    trie = {}       # (code of p, c) -> code of p + c
+    next_code = len(initial)
     output = []
-    p = value[0]
+    start = len(preset) if preset else 0
+    if start:
+        value = preset + value
+    if len(value) == start:
+        return output
+    p = initial[value[0]]
+    skip = 0        # number of codes covering the preset
 
     for i in range(1, len(value)):
         c = value[i]
         # If p=p+c in table, continue adding to p
         # Goal: see if we can get a bigger prefix to later add
-        if p + c in table:
-            p = p + c
+        # (the match always ends at the end of the preset)
+        code = trie.get((p, c)) if i != start else None
+        if i == start:
+            skip = len(output) + 1
+        if code is not None:
+            p = code
         # if p+c not in table, make new table entry for p+c and start over with p=c
         else:
-            output.append(table.index(p))
-            table.append(str(p+c))
-            p = c
+            output.append(p)
+            if max_table_size is None or next_code < max_table_size:
+                trie[(p, c)] = next_code
+                next_code += 1
+            else:
+                # table full: start over from the initial entries
+                trie.clear()
+                next_code = len(initial)
+            p = initial[c]
     # append any residual accumulation from p to output
-    output.append(table.index(p))
-    return output
+    output.append(p)
+    return output[skip:] if skip else output
+
 
 
 
+# +++++++++++++++ Decompression Functions +++++++++++++++ #
+
+def decompress_LZ77(tokens, window_size=32768, chunk_size=1 << 16, preset=None):
+    """
+    Streaming LZ77 decoder for the tokens of compress_LZ77 / compress_LZ77_fast.
+    Generator yielding the decoded text in pieces of about chunk_size
+    (str for str tokens, bytes for bytes tokens). Only the last window_size
+    symbols are kept, so memory stays bounded however long the input is.
+    tokens:         iterable of (offset, length, next char)
+    window_size:    at least the window the encoder used
+    preset:         the same preset given to compress_LZ77_fast
+    """
+    history = None
+    if preset:
+        history = preset if isinstance(preset, str) else bytearray(preset)
+    pending = []
+    pending_size = 0
+    for offset, length, next_char in tokens:
+        if history is None:
+            # str tokens decode to str, bytes tokens to bytes
+            history = next_char[:0] if isinstance(next_char, str) else bytearray()
+        if length:
+            start = len(history) - offset
+            if offset >= length:
+                piece = history[start:start + length]
+            else:
+                # overlapping copy: the match repeats its last offset symbols
+                piece = (history[start:] * (length // offset + 1))[:length]
+            piece += next_char
+        else:
+            piece = next_char
+        history += piece
+        if len(history) > 2 * window_size:
+            history = history[-window_size:]
+        pending.append(piece)
+        pending_size += len(piece)
+        if pending_size >= chunk_size:
+            yield _join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield _join(pending)
+
+def _join(pieces):
+    """ Helper concatenating str or bytes-like pieces into one str or bytes. """
+    if isinstance(pieces[0], str):
+        return "".join(pieces)
+    return b"".join(pieces)
+
+def decompress_LZ78(tokens, max_dict_size=None, chunk_size=1 << 16, preset=None):
+    """
+    Streaming LZ78 decoder for the tokens of compress_LZ78.
+    Rebuilds the same dictionary as the encoder: each token (index, char)
+    outputs entry[index] + char, which also becomes the next entry
+    (index 0 is the empty string).
+    Generator yielding the decoded text in pieces of about chunk_size.
+    max_dict_size:  the same value given to compress_LZ78
+    preset:         the same preset given to compress_LZ78
+    """
+    dictionary = None
+    pending = []
+    pending_size = 0
+    # a preset primes the dictionary with its own complete tokens, whose output is dropped
+    skip = 0
+    if preset:
+        preset_tokens = compress_LZ78(preset, max_dict_size=max_dict_size)
+        if not preset_tokens[-1][1]:
+            preset_tokens.pop()
+        skip = len(preset_tokens)
+        tokens = itertools.chain(preset_tokens, tokens)
+    for i, (index, next_char) in enumerate(tokens):
+        if dictionary is None:
+            dictionary = [next_char[:0]]
+        entry = dictionary[index] + next_char
+        dictionary.append(entry)
+        if max_dict_size is not None and len(dictionary) - 1 >= max_dict_size:
+            del dictionary[1:]
+        if i < skip:
+            continue
+        pending.append(entry)
+        pending_size += len(entry)
+        if pending_size >= chunk_size:
+            yield _join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield _join(pending)
+
+def decompress_LZW(codes, table=None, max_table_size=None, chunk_size=1 << 16, preset=None):
+    """
+    Streaming LZW decoder for the codes of compress_LZW.
+    Rebuilds the encoder's table one step behind it: after outputting code
+    c, the entry for (previous output + first char of c's output) is added.
+    The one code the decoder can't know yet is the entry being created
+    right now (the "cScSc" case), whose output is previous + previous[0].
+    Generator yielding the decoded text in pieces of about chunk_size.
+    table:          the same initial table given to compress_LZW
+    max_table_size: the same value given to compress_LZW
+    preset:         the same preset given to compress_LZW
+    """
+    # a preset primes the table with its own codes, whose output is dropped
+    skip = 0
+    if preset:
+        preset_codes = compress_LZW(preset, table, max_table_size)
+        skip = len(preset_codes)
+        codes = itertools.chain(preset_codes, codes)
+    initial = ["a", "b", "c", "d", "r"] if table is None else list(table)
+    # byte values decode to one-byte strings
+    initial = [bytes([char]) if isinstance(char, int) else char for char in initial]
+    table = list(initial)
+    previous = None
+    pending = []
+    pending_size = 0
+    for i, code in enumerate(codes):
+        if previous is not None and max_table_size is not None and len(table) >= max_table_size:
+            # the encoder found the table full and started over instead of adding an entry
+            table = list(initial)
+            previous = None
+        if code < len(table):
+            entry = table[code]
+        elif code == len(table) and previous is not None:
+            entry = previous + previous[:1]
+        else:
+            raise ValueError(f"invalid LZW code {code}")
+        if previous is not None:
+            table.append(previous + entry[:1])
+        previous = entry
+        if i < skip:
+            continue
+        pending.append(entry)
+        pending_size += len(entry)
+        if pending_size >= chunk_size:
+            yield _join(pending)
+            pending, pending_size = [], 0
+    if pending:
+        yield _join(pending)
+
+
+
+# +++++++++++++++ Bit-Packed Container +++++++++++++++ #
+# Binary format for LZW codes, LZ78 and LZ77 tokens:
+#   header:  magic "LZB1", codec (1 = LZW, 2 = LZ78, 3 = LZ77), flags (bit 0: chars are str),
+#            two codec parameters: initial table size and max table/dictionary size
+#            (0 = unbounded), or window size and lookahead buffer size for LZ77,
+#            and the number of tokens a preset dictionary primed the table with
+#   frames:  payload byte length, token count, flags (bit 0: the last LZ78/LZ77
+#            token has no next char, bit 1: chars are 21-bit code points),
+#            then the bit-packed payload
+# Chars take 8 bits (bytes, or str of chars up to U+00FF); a frame holding
+# any str char above U+00FF stores all its chars as 21-bit code points.
+# Code widths are never stored: both sides derive the table size at every
+# token from the token's position alone, so each code takes exactly as many
+# bits as the table needs at that point (8 growing to 16 bits for LZW over
+# bytes with a 65536-entry table). LZ77 offsets and lengths have fixed widths.
+# Frames let a reader stream the tokens without holding the whole payload,
+# and a writer flush each frame to a file or socket as soon as it is full.
+
+MAGIC = b"LZB1"
+LZW_CODEC, LZ78_CODEC, LZ77_CODEC = 1, 2, 3
+_HEADER = struct.Struct("<4sBBIII")
+_FRAME = struct.Struct("<IIB")
+# frame flags
+NO_LAST_CHAR = 1
+WIDE_CHARS = 2
+
+def _bits(n):
+    """ Bits needed to store values in [0, n). """
+    return max(1, (n - 1).bit_length())
+
+class BitWriter:
+    """
+    Appends values of any bit width to a bytearray, least significant bit first.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+        self.acc = 0
+        self.num_bits = 0
+
+    def write(self, value, width):
+        # a value wider than its field would silently spill into the next one
+        if not 0 <= value < 1 << width:
+            raise ValueError(f"value {value} does not fit in {width} bits")
+        self.acc |= value << self.num_bits
+        self.num_bits += width
+        while self.num_bits >= 8:
+            self.buffer.append(self.acc & 0xFF)
+            self.acc >>= 8
+            self.num_bits -= 8
+
+    def finish(self):
+        """ Pad the last partial byte with zeros and return the buffer. """
+        if self.num_bits:
+            self.buffer.append(self.acc & 0xFF)
+            self.acc = 0
+            self.num_bits = 0
+        return self.buffer
+
+class BitReader:
+    """
+    Reads values written by BitWriter from a memoryview, without copying it.
+    """
+    def __init__(self, view):
+        self.view = view
+        self.pos = 0
+        self.acc = 0
+        self.num_bits = 0
+
+    def read(self, width):
+        while self.num_bits < width:
+            self.acc |= self.view[self.pos] << self.num_bits
+            self.pos += 1
+            self.num_bits += 8
+        value = self.acc & ((1 << width) - 1)
+        self.acc >>= width
+        self.num_bits -= width
+        return value
+
+def _LZW_widths(initial_size, max_table_size, start=0):
+    """
+    Width of every LZW code in turn, mirroring the table growth/reset of
+    compress_LZW, from the code at position start on.
+    """
+    size = initial_size
+    for _ in range(start):
+        size = size + 1 if not max_table_size or size < max_table_size else initial_size
+    while True:
+        yield _bits(size)
+        size = size + 1 if not max_table_size or size < max_table_size else initial_size
+
+def _LZ78_widths(max_dict_size, start=0):
+    """
+    Width of every LZ78 index in turn, mirroring the dictionary growth/reset
+    of compress_LZ78, from the token at position start on.
+    """
+    size = start % max_dict_size if max_dict_size else start
+    while True:
+        yield _bits(size + 1)
+        size += 1
+        if max_dict_size and size >= max_dict_size:
+            size = 0
+
+def _pack(codec, tokens, write_token, char_index, initial_size, max_size, start, chunk_tokens, out):
+    """
+    Helper writing the header and the frames. write_token(writer, token)
+    bit-packs one token's codes; if char_index is not None, token[char_index]
+    is the token's next char, written after them (see _char_reader).
+    Frames are written to out (anything with a write method) as soon as
+    they are full, or collected in one bytearray if out is None.
+    Returns the bytearray, or the number of bytes written to out.
+    """
+    result = bytearray()
+    emit = result.extend if out is None else out.write
+    tokens = iter(tokens)
+    frame = list(itertools.islice(tokens, chunk_tokens))
+    is_str = char_index is not None and bool(frame) and isinstance(frame[0][char_index], str)
+    emit(_HEADER.pack(MAGIC, codec, int(is_str), initial_size, max_size or 0, start))
+    written = _HEADER.size
+    while frame:
+        frame_flags = 0
+        char_width = 8
+        # a whole frame is collected first, so its char width is known before any char is written
+        if is_str and any(ord(token[char_index]) > 0xFF for token in frame if token[char_index]):
+            frame_flags |= WIDE_CHARS
+            char_width = 21
+        writer = BitWriter()
+        for token in frame:
+            write_token(writer, token)
+            if char_index is None:
+                continue
+            char = token[char_index]
+            if char:
+                writer.write(ord(char) if is_str else char[0], char_width)
+            else:
+                # only the final token can lack a next char; flag it in its frame
+                frame_flags |= NO_LAST_CHAR
+        payload = writer.finish()
+        emit(_FRAME.pack(len(payload), len(frame), frame_flags))
+        emit(memoryview(payload))
+        written += _FRAME.size + len(payload)
+        frame = list(itertools.islice(tokens, chunk_tokens)) if len(frame) == chunk_tokens else []
+    return result if out is None else written
+
+def _char_reader(flags, frame_flags, reader):
+    """
+    Helper returning (read_char, empty char) for a frame: read_char() reads
+    one next char written by _pack, as a str or a one-byte bytes.
+    """
+    width = 21 if frame_flags & WIDE_CHARS else 8
+    if flags & 1:
+        return (lambda: chr(reader.read(width))), ""
+    return (lambda: bytes([reader.read(width)])), b""
+
+def _frames(buffer, codec):
+    """
+    Helper checking the header of a packed buffer and yielding
+    (header fields, token count, frame flags, BitReader) for every frame.
+    """
+    view = memoryview(buffer)
+    magic, found_codec, flags, initial_size, max_size, start = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC or found_codec != codec:
+        raise ValueError("not a packed stream of this codec")
+    pos = _HEADER.size
+    while pos < len(view):
+        length, count, frame_flags = _FRAME.unpack_from(view, pos)
+        pos += _FRAME.size
+        yield (flags, initial_size, max_size, start), count, frame_flags, BitReader(view[pos:pos + length])
+        pos += length
+
+def pack_LZW(codes, initial_size=256, max_table_size=None, chunk_tokens=1 << 16, out=None, start=0):
+    """
+    Bit-pack the codes of compress_LZW, each as wide as the table at that point.
+    initial_size:   size of the initial table given to compress_LZW
+    max_table_size: the same value given to compress_LZW
+    chunk_tokens:   codes per frame
+    out:            file-like object to stream frames to (None: return a bytearray)
+    start:          codes the table was primed with by a preset dictionary
+                    (len(compress_LZW(preset, ...)))
+    """
+    widths = _LZW_widths(initial_size, max_table_size, start)
+
+    def write_token(writer, code):
+        writer.write(code, next(widths))
+
+    return _pack(LZW_CODEC, codes, write_token, None, initial_size, max_table_size, start, chunk_tokens, out)
+
+def unpack_LZW(buffer):
+    """
+    Generator over the codes of a pack_LZW buffer (bytes, bytearray,
+    memoryview or mmap), decoded lazily frame by frame.
+    """
+    widths = None
+    for (flags, initial_size, max_size, start), count, frame_flags, reader in _frames(buffer, LZW_CODEC):
+        widths = widths or _LZW_widths(initial_size, max_size, start)
+        for _ in range(count):
+            yield reader.read(next(widths))
+
+def pack_LZ78(tokens, max_dict_size=None, chunk_tokens=1 << 16, out=None, start=0):
+    """
+    Bit-pack the tokens of compress_LZ78: an index as wide as the dictionary
+    at that point, and a char (8 bits, or 21 for str chars above U+00FF).
+    max_dict_size:  the same value given to compress_LZ78
+    chunk_tokens:   tokens per frame
+    out:            file-like object to stream frames to (None: return a bytearray)
+    start:          entries the dictionary was primed with by a preset dictionary
+                    (complete tokens of compress_LZ78(preset, ...))
+    """
+    widths = _LZ78_widths(max_dict_size, start)
+
+    def write_token(writer, token):
+        writer.write(token[0], next(widths))
+
+    return _pack(LZ78_CODEC, tokens, write_token, 1, 0, max_dict_size, start, chunk_tokens, out)
+
+def unpack_LZ78(buffer):
+    """
+    Generator over the (index, next char) tokens of a pack_LZ78 buffer,
+    decoded lazily frame by frame.
+    """
+    widths = None
+    frames = _frames(buffer, LZ78_CODEC)
+    for (flags, _, max_size, start), count, frame_flags, reader in frames:
+        widths = widths or _LZ78_widths(max_size, start)
+        read_char, empty = _char_reader(flags, frame_flags, reader)
+        for i in range(count):
+            index = reader.read(next(widths))
+            if i == count - 1 and frame_flags & NO_LAST_CHAR:
+                yield index, empty
+            else:
+                yield index, read_char()
+
+def pack_LZ77(tokens, window_size=32768, lookahead_buffer_size=258, chunk_tokens=1 << 16, out=None):
+    """
+    Bit-pack the tokens of compress_LZ77 / compress_LZ77_fast: an offset
+    and a length as wide as window_size and lookahead_buffer_size need,
+    and a char (8 bits, or 21 for str chars above U+00FF).
+    chunk_tokens:   tokens per frame
+    out:            file-like object to stream frames to (None: return a bytearray)
+    """
+    offset_width, length_width = _bits(window_size + 1), _bits(lookahead_buffer_size + 1)
+
+    def write_token(writer, token):
+        writer.write(token[0], offset_width)
+        writer.write(token[1], length_width)
+
+    return _pack(LZ77_CODEC, tokens, write_token, 2, window_size, lookahead_buffer_size, 0, chunk_tokens, out)
+
+def unpack_LZ77(buffer):
+    """
+    Generator over the (offset, length, next char) tokens of a pack_LZ77
+    buffer, decoded lazily frame by frame.
+    """
+    for (flags, window_size, lookahead_buffer_size, _), count, frame_flags, reader in _frames(buffer, LZ77_CODEC):
+        offset_width, length_width = _bits(window_size + 1), _bits(lookahead_buffer_size + 1)
+        read_char, empty = _char_reader(flags, frame_flags, reader)
+        for i in range(count):
+            offset = reader.read(offset_width)
+            length = reader.read(length_width)
+            if i == count - 1 and frame_flags & NO_LAST_CHAR:
+                yield offset, length, empty
+            else:
+                yield offset, length, read_char()
+
+
+
+# +++++++++++++++++++ Block Mode ++++++++++++++++++++ #
+# Container of independently compressed blocks, for parallel compression
+# and random access:
+#   header:  magic "LZX1", codec name (8 bytes), block size, preset length
+#   preset:  the preset dictionary every block was primed with (may be empty)
+#   blocks:  one pack_* buffer per block, back to back
+#   index:   (offset, compressed length, raw length) of every block
+#   trailer: offset of the index, number of blocks
+# The index is written last so blocks can be streamed out as they finish;
+# a reader finds it through the fixed-size trailer at the end.
+
+BLOCK_MAGIC = b"LZX1"
+_BLOCK_HEADER = struct.Struct("<4s8sII")
+_BLOCK_ENTRY = struct.Struct("<QII")
+_BLOCK_TRAILER = struct.Struct("<QI")
+
+# LZW over bytes: every byte value starts in the table
+BYTE_TABLE = list(range(256))
+
+def _LZ78_start(preset):
+    """ Entries a preset primes the LZ78 dictionary with: its complete tokens. """
+    return sum(1 for _, next_char in compress_LZ78(preset) if next_char) if preset else 0
+
+def _LZW_start(preset):
+    """ Codes a preset primes the LZW table with. """
+    return len(compress_LZW(preset, BYTE_TABLE)) if preset else 0
+
+# name -> (compress bytes to a packed buffer, decompress a packed buffer to bytes),
+# both taking the preset dictionary (bytes or None)
+BLOCK_CODECS = {
+    "LZ77": (lambda data, preset: pack_LZ77(compress_LZ77_fast(data, preset=preset)),
+             lambda packed, preset: b"".join(decompress_LZ77(unpack_LZ77(packed), preset=preset))),
+    "LZ78": (lambda data, preset: pack_LZ78(compress_LZ78(data, preset=preset), start=_LZ78_start(preset)),
+             lambda packed, preset: b"".join(decompress_LZ78(unpack_LZ78(packed), preset=preset))),
+    "LZW": (lambda data, preset: pack_LZW(compress_LZW(data, BYTE_TABLE, preset=preset), start=_LZW_start(preset)),
+            lambda packed, preset: b"".join(decompress_LZW(unpack_LZW(packed), BYTE_TABLE, preset=preset))),
+}
+
+def _compress_block(args):
+    """ Worker compressing one block (module level so a process pool can run it). """
+    codec, block, preset = args
+    return BLOCK_CODECS[codec][0](block, preset)
+
+def _decompress_block(args):
+    """ Worker decompressing one block. """
+    codec, packed, preset = args
+    return BLOCK_CODECS[codec][1](packed, preset)
+
+def _map_blocks(worker, jobs, workers):
+    """
+    Helper yielding worker(job) for every job in order, computed in this
+    process (workers == 1) or on a pool of workers processes (None: one per
+    CPU). At most 2 jobs per process are in flight at a time, and a new job
+    is only submitted (and so only read and pickled) once the oldest result
+    is handed out, so memory stays bounded however many jobs there are.
+    """
+    if workers == 1:
+        yield from map(worker, jobs)
+        return
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for job in jobs:
+            if len(pending) == 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(worker, job))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def compress_blocks(data, codec="LZW", block_size=1 << 20, preset=None, workers=None, out=None):
+    """
+    Block mode: split data into blocks of block_size bytes, compress every
+    block independently (each primed with the same preset dictionary, if
+    given) on a process pool, and write them into an indexed container.
+    Blocks can't refer to each other, which costs some compression ratio
+    (see benchmark_blocks), but makes compression parallel and any block
+    decompressible on its own (see decompress_block).
+    data:       bytes-like input
+    codec:      name of an entry in BLOCK_CODECS
+    block_size: raw bytes per block
+    preset:     bytes every block is primed with, e.g. a sample of typical input
+    workers:    processes to use (None: one per CPU, 1: compress in this process)
+    out:        file-like object to stream the container to (None: return a bytearray)
+    Returns the container, or the number of bytes written to out.
+    """
+    if codec not in BLOCK_CODECS:
+        raise ValueError(f"unknown codec {codec!r}, expected one of {list(BLOCK_CODECS)}")
+    view = memoryview(data).cast("B")
+    preset = bytes(preset) if preset else b""
+    blocks = (bytes(view[i:i + block_size]) for i in range(0, len(view), block_size))
+    jobs = ((codec, block, preset) for block in blocks)
+    result = bytearray()
+    emit = result.extend if out is None else out.write
+    emit(_BLOCK_HEADER.pack(BLOCK_MAGIC, codec.encode(), block_size, len(preset)))
+    emit(preset)
+    position = _BLOCK_HEADER.size + len(preset)
+    index = []
+    # blocks come back in order, and are written out as soon as they are ready
+    for i, packed in enumerate(_map_blocks(_compress_block, jobs, workers)):
+        emit(packed)
+        raw_length = min(block_size, len(view) - i * block_size)
+        index.append(_BLOCK_ENTRY.pack(position, len(packed), raw_length))
+        position += len(packed)
+    emit(b"".join(index))
+    emit(_BLOCK_TRAILER.pack(position, len(index)))
+    return result if out is None else position + len(index) * _BLOCK_ENTRY.size + _BLOCK_TRAILER.size
+
+def read_block_index(buffer):
+    """
+    Read the header and index of a compress_blocks container (bytes,
+    bytearray, memoryview or mmap), without touching the blocks.
+    Returns (codec, block size, preset, list of (offset, compressed length, raw length)).
+    """
+    view = memoryview(buffer)
+    magic, codec, block_size, preset_length = _BLOCK_HEADER.unpack_from(view, 0)
+    if magic != BLOCK_MAGIC:
+        raise ValueError("not a block mode container")
+    preset = bytes(view[_BLOCK_HEADER.size:_BLOCK_HEADER.size + preset_length])
+    index_offset, num_blocks = _BLOCK_TRAILER.unpack_from(view, len(view) - _BLOCK_TRAILER.size)
+    index = [_BLOCK_ENTRY.unpack_from(view, index_offset + i * _BLOCK_ENTRY.size) for i in range(num_blocks)]
+    return codec.rstrip(b"\0").decode(), block_size, preset, index
+
+def decompress_block(buffer, i, block_index=None):
+    """
+    Random access: decompress block i of a compress_blocks container,
+    reading only its header, index and that block.
+    block_index:    result of read_block_index(buffer), to skip reading it again
+    """
+    codec, _, preset, index = read_block_index(buffer) if block_index is None else block_index
+    offset, length, _ = index[i]
+    return _decompress_block((codec, memoryview(buffer)[offset:offset + length], preset))
+
+def decompress_blocks(buffer, workers=1):
+    """
+    Generator yielding every block of a compress_blocks container in order.
+    workers:    processes to use (None: one per CPU, 1: decompress in this process)
+    """
+    codec, _, preset, index = read_block_index(buffer)
+    view = memoryview(buffer)
+    if workers == 1:
+        for offset, length, _ in index:
+            yield _decompress_block((codec, view[offset:offset + length], preset))
+        return
+    # memoryviews can't be sent to other processes, so the blocks are copied to bytes
+    jobs = ((codec, bytes(view[offset:offset + length]), preset) for offset, length, _ in index)
+    yield from _map_blocks(_decompress_block, jobs, workers)
+
+
+
+# ++++++++++++++++++++ Benchmark +++++++++++++++++++++ #
+
+# name -> (compress bytes, decompress to bytes, compressed size in bytes)
+# the LZ codecs go through their bit-packed containers
+CODECS = {
+    "LZ77": (lambda data: pack_LZ77(compress_LZ77_fast(data)),
+             lambda packed: b"".join(decompress_LZ77(unpack_LZ77(packed))),
+             len),
+    "LZ78": (lambda data: pack_LZ78(compress_LZ78(data)),
+             lambda packed: b"".join(decompress_LZ78(unpack_LZ78(packed))),
+             len),
+    "LZW": (lambda data: pack_LZW(compress_LZW(data, BYTE_TABLE)),
+            lambda packed: b"".join(decompress_LZW(unpack_LZW(packed), BYTE_TABLE)),
+            len),
+    "zlib": (zlib.compress, zlib.decompress, len),
+}
+
+def make_corpus(size=1 << 16, seed=0):
+    """
+    Small standard corpus of size bytes per entry: English-like text,
+    structured binary (little-endian counters and small values),
+    highly repetitive and uniformly random data.
+    """
+    rng = random.Random(seed)
+    words = ["the", "of", "and", "to", "in", "a", "is", "that", "for", "it", "as", "was", "with",
+             "be", "by", "on", "not", "he", "this", "are", "or", "his", "from", "at", "which",
+             "compression", "dictionary", "window", "string", "buffer", "prefix", "match"]
+    text = " ".join(rng.choice(words) for _ in range(size)).encode()[:size]
+    binary = b"".join(i.to_bytes(4, "little") + rng.randrange(16).to_bytes(2, "little") for i in range(size // 6 + 1))[:size]
+    repetitive = (b"abracadabraarbadacarba" * (size // 22 + 1))[:size]
+    return {"text": text, "binary": binary, "repetitive": repetitive, "random": rng.randbytes(size)}
+
+def benchmark_codecs(corpus=None, codecs=tuple(CODECS)):
+    """
+    Run every codec on every corpus entry, check the round trip is
+    byte-exact, and report compression ratio (input / bit-packed size),
+    compress and decompress MB/s and peak traced memory (tracemalloc,
+    measured on a separate untimed run).
+    Returns a list of result rows (dicts), and prints them as a table.
+    corpus: dict of name -> bytes (defaults to make_corpus())
+    codecs: names of entries in CODECS
+    """
+    corpus = make_corpus() if corpus is None else corpus
+    results = []
+    print(f"{'codec':<8}{'input':<12}{'ratio':>8}{'comp MB/s':>11}{'decomp MB/s':>13}{'peak KB':>10}  round trip")
+    for name in codecs:
+        compress, decompress, size = CODECS[name]
+        for corpus_name, data in corpus.items():
+            start = time.perf_counter()
+            compressed = compress(data)
+            compress_time = time.perf_counter() - start
+            start = time.perf_counter()
+            restored = decompress(compressed)
+            decompress_time = time.perf_counter() - start
+            # second, traced run for memory (tracemalloc slows the code down, so it isn't timed)
+            tracemalloc.start()
+            decompress(compress(data))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            row = {
+                "codec": name, "input": corpus_name,
+                "ratio": len(data) / max(1, size(compressed)),
+                "compress_mb_per_s": len(data) / compress_time / 1e6,
+                "decompress_mb_per_s": len(data) / decompress_time / 1e6,
+                "peak_bytes": peak,
+                "round_trip": restored == data,
+            }
+            results.append(row)
+            print(f"{name:<8}{corpus_name:<12}{row['ratio']:>8.3f}{row['compress_mb_per_s']:>11.3f}"
+                  f"{row['decompress_mb_per_s']:>13.3f}{peak / 1024:>10.1f}  {'ok' if row['round_trip'] else 'FAILED'}")
+    return results
+
+def benchmark_blocks(data=None, codecs=tuple(BLOCK_CODECS), block_sizes=(1 << 14, 1 << 16), workers=(1, 2, 4), preset=None):
+    """
+    Block mode benchmark: for every codec, compress data whole (one block,
+    in this process) and in blocks of every block size on every number of
+    workers, and report the compression ratio, its cost relative to the
+    whole-input ratio (blocks can't match across block boundaries), compress
+    MB/s and the speedup over one worker.
+    Returns a list of result rows (dicts), and prints them as a table.
+    data:       bytes to compress (defaults to 256 KB of make_corpus text)
+    preset:     preset dictionary every block (and the whole input) is primed with
+    """
+    data = make_corpus(1 << 18)["text"] if data is None else data
+    results = []
+    print(f"{'codec':<8}{'block KB':>9}{'workers':>9}{'ratio':>8}{'cost %':>8}{'comp MB/s':>11}{'speedup':>9}")
+    for name in codecs:
+        whole_ratio = len(data) / len(BLOCK_CODECS[name][0](data, preset))
+        print(f"{name:<8}{'whole':>9}{1:>9}{whole_ratio:>8.3f}{0:>8.1f}")
+        for block_size in block_sizes:
+            serial_time = None
+            for num_workers in workers:
+                start = time.perf_counter()
+                container = compress_blocks(data, name, block_size, preset, num_workers)
+                elapsed = time.perf_counter() - start
+                serial_time = serial_time or elapsed
+                ratio = len(data) / len(container)
+                row = {
+                    "codec": name, "block_size": block_size, "workers": num_workers,
+                    "ratio": ratio, "whole_ratio": whole_ratio,
+                    "ratio_cost": 1 - ratio / whole_ratio,
+                    "compress_mb_per_s": len(data) / elapsed / 1e6,
+                    "speedup": serial_time / elapsed,
+                }
+                results.append(row)
+                print(f"{name:<8}{block_size // 1024:>9}{num_workers:>9}{ratio:>8.3f}{100 * row['ratio_cost']:>8.1f}"
+                      f"{row['compress_mb_per_s']:>11.3f}{row['speedup']:>9.2f}")
+    return results
+
+
 
 # +++++++++++++++++++ Main Function +++++++++++++++++++ #
 
@@ -233,4 +1054,16 @@ if __name__ == "__main__":
     print("LZ77", LZ77_compressed)
     print("LZ78", LZ78_compressed)
     print("LZW", LZW_compressed)
+    print("LZ77 decoded", "".join(decompress_LZ77(LZ77_compressed)))
+    print("LZ78 decoded", "".join(decompress_LZ78(LZ78_compressed)))
+    print("LZW decoded", "".join(decompress_LZW(LZW_compressed)))
+
+    # bit-packed round trips, including text beyond Latin-1 (chars above U+00FF take 21 bits)
+    for text in (str_to_compress, "héllo wörld ☃☃☃"):
+        LZ78_tokens = compress_LZ78(text)
+        assert list(unpack_LZ78(pack_LZ78(LZ78_tokens))) == LZ78_tokens
+        print("LZ78 packed round trip", "".join(decompress_LZ78(unpack_LZ78(pack_LZ78(LZ78_tokens)))))
+        for LZ77_tokens in (compress_LZ77(text, window_size, lookahead_buffer_size), compress_LZ77_fast(text)):
+            assert list(unpack_LZ77(pack_LZ77(LZ77_tokens))) == LZ77_tokens
+        print("LZ77 packed round trip", "".join(decompress_LZ77(unpack_LZ77(pack_LZ77(LZ77_tokens)))))
 
@@ -16,26 +16,121 @@ For this problem, you may use any libraries or tools
 """
 
 # +++++++++++++++++ Installs/Imports +++++++++++++++++ #
+import time
 import numpy as np
-from scipy.linalg import hadamard
 
 
 # ++++++++++++++++++++ Functions +++++++++++++++++++++ #
 
-def conduct_experiment(d=1024):
+def next_power_of_two(d):
+    """
+    Smallest power of two >= d (the Hadamard transform needs a power-of-two length).
+    """
+    return 1 << max(0, int(d - 1).bit_length())
+
+def _small_hadamard(m, dtype):
+    """
+    Helper building the m x m Sylvester Hadamard matrix (m a small power of two).
+    """
+    H = np.ones((1, 1), dtype=dtype)
+    while H.shape[0] < m:
+        H = np.block([[H, H], [H, -H]])
+    return H
+
+def fwht(x, base=32):
+    """
+    Fast Walsh-Hadamard transform along the last axis, O(d log d), written
+    back into x (which is also returned).
+    Equivalent to x @ hadamard(d) without ever building the d x d matrix.
+    Unnormalized: applying it twice multiplies x by d.
+    The lowest log2(base) butterfly levels are done together as one matmul
+    with a tiny base x base Hadamard matrix (those levels have very short
+    strides, which numpy handles slowly); the remaining levels ping-pong
+    between x and one scratch buffer the size of x. A non-contiguous x
+    (e.g. a transposed view) is transformed in a contiguous copy, which is
+    then copied back into it.
+    x:      float array whose last axis has power-of-two length (modified in place)
+    base:   power of two, size of the small Hadamard block
+    """
+    d = x.shape[-1]
+    if d & (d - 1):
+        raise ValueError(f"fwht needs a power-of-two length, got {d}")
+    # reshape only gives a view of C-contiguous data; otherwise work on a copy
+    work = x if x.flags.c_contiguous else np.ascontiguousarray(x)
+    flat = work.reshape(-1, d)
+    h = min(base, d)
+    scratch = np.empty_like(flat)
+    np.matmul(flat.reshape(-1, h), _small_hadamard(h, x.dtype), out=scratch.reshape(-1, h))
+    src, dst = scratch, flat
+    while h < d:
+        # view the data as (rest, blocks, 2, h): each butterfly level combines
+        # the two halves of every block of length 2h
+        pairs = src.reshape(src.shape[0], d // (2 * h), 2, h)
+        out = dst.reshape(dst.shape[0], d // (2 * h), 2, h)
+        np.add(pairs[:, :, 0, :], pairs[:, :, 1, :], out=out[:, :, 0, :])
+        np.subtract(pairs[:, :, 0, :], pairs[:, :, 1, :], out=out[:, :, 1, :])
+        src, dst = dst, src
+        h *= 2
+    if src is not flat:
+        flat[...] = src
+    if work is not x:
+        x[...] = work
+    return x
+
+def random_signs(d, rng=None):
+    """
+    Random +-1 diagonal for the Randomized Hadamard Transform, padded to a power of two.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.choice(np.array([-1.0, 1.0]), size=next_power_of_two(d))
+
+def rht(x, signs):
+    """
+    Randomized Hadamard Transform: H D x / sqrt(D), with D = diag(signs).
+    Vectors (or rows of a matrix) whose length d is not a power of two are
+    zero-padded up to len(signs), so the output has len(signs) coordinates.
+    x:      vector, or matrix of row vectors, of length d <= len(signs)
+    signs:  random +-1 diagonal from random_signs (or one diagonal per row of x)
+    """
+    x = np.asarray(x)
+    dim = signs.shape[-1]
+    out = np.zeros(x.shape[:-1] + (dim,), dtype=np.result_type(x.dtype, np.float32))
+    out[..., :x.shape[-1]] = x
+    out *= signs
+    fwht(out)
+    out /= np.sqrt(dim)
+    return out
+
+def inverse_rht(y, signs, d=None):
+    """
+    Exact inverse of rht: D H y / sqrt(D), truncated back to the first d coordinates.
+    y:      output of rht (vector or matrix of row vectors)
+    signs:  the same +-1 diagonal used by rht
+    d:      original length before padding (defaults to len(signs))
+    """
+    out = np.array(y, dtype=np.result_type(np.asarray(y).dtype, np.float32))
+    fwht(out)
+    out /= np.sqrt(signs.shape[-1])
+    out *= signs
+    return out[..., :signs.shape[-1] if d is None else d]
+
+def conduct_experiment(d=1024, rng=None):
     """ 
     Perform one iteration of the steps 
     described in the problem above. 
-    d: dimension
+    d:      dimension (need not be a power of two; it is padded for the transform)
+    rng:    numpy Generator, for reproducible runs
     """
+    rng = np.random.default_rng() if rng is None else rng
     # Step 1: generate a random vector point on the d-dimensional unit sphere
-    original_vec = np.random.normal(0,1,d)
+    original_vec = rng.normal(0,1,d)
     original_vec = original_vec / np.linalg.norm(original_vec)
 
     # Step 2: rotate point using RHT
-    # To do RHT, create a Hadamard matrix
-    H = hadamard(d) / np.sqrt(d)
-    rotated_vec = H @ original_vec
+    # Random sign flips (D) followed by a fast Walsh-Hadamard transform (H),
+    # so no d x d Hadamard matrix is ever built
+    signs = random_signs(d, rng)
+    rotated_vec = rht(original_vec, signs)
 
     # Step 3: quantize point's coordinates to either -1 or 1
     # Do so by rounding sign, not stochastic
@@ -45,35 +140,339 @@ def conduct_experiment(d=1024):
     quantized_vec /= np.linalg.norm(quantized_vec)
 
     # Step 4: inverse the rotation using RHT
-    # This requires us to inverse our Hadamard matrix
-    recovered_vec = H.T @ quantized_vec
+    # H is symmetric and D is its own inverse, so this is D H y / sqrt(d)
+    recovered_vec = inverse_rht(quantized_vec, signs, d)
 
     # Step 5: determine MSE between result_point and point
     return np.mean((recovered_vec - original_vec) ** 2)
 
 
 
+def conduct_experiments(trials=100, d=1024, dtype=np.float64, seed=None, batch_size=4096):
+    """
+    Batched version of conduct_experiment: runs all trials as (batch x d)
+    matrices, so every step (rotate, sign-quantize, renormalize,
+    inverse-rotate, per-row MSE) is one vectorized operation over the batch.
+    Each trial still draws its own point and its own random sign diagonal.
+    Trials are processed batch_size rows at a time to bound memory.
+    Returns a dict with the per-trial MSEs and their distribution stats.
+    trials:     number of experiments
+    d:          dimension (need not be a power of two)
+    dtype:      np.float32 or np.float64, precision of the whole pipeline
+    seed:       seed for the random generator, for reproducible runs
+    batch_size: rows processed at once
+    """
+    rng = np.random.default_rng(seed)
+    dim = next_power_of_two(d)
+    mse = np.empty(trials, dtype=dtype)
+    for start in range(0, trials, batch_size):
+        rows = min(batch_size, trials - start)
+        # Step 1: one random point on the unit sphere per row
+        original = rng.standard_normal((rows, d), dtype=dtype)
+        original /= np.linalg.norm(original, axis=1, keepdims=True)
+        # Step 2: rotate every row with its own random sign diagonal
+        signs = (2 * rng.integers(0, 2, size=(rows, dim), dtype=np.int8) - 1).astype(dtype)
+        rotated = rht(original, signs)
+        # Step 3: round by sign, then renormalize each row back onto the unit sphere
+        quantized = np.sign(rotated)
+        quantized /= np.linalg.norm(quantized, axis=1, keepdims=True)
+        # Step 4: inverse rotation
+        recovered = inverse_rht(quantized, signs, d)
+        # Step 5: per-row MSE
+        mse[start:start + rows] = np.mean((recovered - original) ** 2, axis=1)
+    percentiles = [1, 5, 25, 50, 75, 95, 99]
+    return {
+        "mse": mse,
+        "min": float(np.min(mse)),
+        "mean": float(np.mean(mse)),
+        "max": float(np.max(mse)),
+        "std": float(np.std(mse)),
+        "percentiles": dict(zip(percentiles, np.percentile(mse, percentiles).tolist())),
+    }
+
+
+
+# +++++++++++++++++++ Quantizers +++++++++++++++++++++ #
+# Every quantizer works on rows of already-rotated vectors (the shared RHT
+# front end) and is an (encode, decode) pair:
+#   encode(rotated, bits, rng) -> (levels, params)   integer levels in [0, 2^bits)
+#                                                     and float32 per-row parameters
+#   decode(levels, params, bits) -> rotated approximation
+
+def _sign_encode(rotated, bits, rng):
+    """ Round by sign (1 bit), keep the row norm. """
+    return (rotated > 0).astype(np.uint8), np.linalg.norm(rotated, axis=1, keepdims=True).astype(np.float32)
+
+def _sign_decode(levels, params, bits):
+    """ +-1 per coordinate, renormalized to the row norm (the original pipeline). """
+    return (2 * levels.astype(params.dtype) - 1) * (params / np.sqrt(levels.shape[1]))
+
+def _sign_scale_encode(rotated, bits, rng):
+    """ Round by sign (1 bit), keep the mean magnitude (the least-squares scale for +-1 codes). """
+    return (rotated > 0).astype(np.uint8), np.mean(np.abs(rotated), axis=1, keepdims=True).astype(np.float32)
+
+def _sign_scale_decode(levels, params, bits):
+    """ +-scale per coordinate. """
+    return (2 * levels.astype(params.dtype) - 1) * params
+
+def _uniform_grid(rotated, bits):
+    """ Helper: per-row [min, max] range split into 2^bits evenly spaced levels. """
+    low = rotated.min(axis=1, keepdims=True)
+    step = (rotated.max(axis=1, keepdims=True) - low) / (2**bits - 1)
+    step[step == 0] = 1
+    return low, step
+
+def _uniform_encode(rotated, bits, rng):
+    """ b-bit uniform scalar quantization, rounding to the nearest level. """
+    low, step = _uniform_grid(rotated, bits)
+    levels = np.rint((rotated - low) / step)
+    return levels.astype(np.uint16), np.hstack([low, step]).astype(np.float32)
+
+def _stochastic_encode(rotated, bits, rng):
+    """
+    b-bit uniform scalar quantization with stochastic rounding: round up with
+    probability equal to the distance past the lower level, so E[decoded] = rotated.
+    """
+    low, step = _uniform_grid(rotated, bits)
+    scaled = (rotated - low) / step
+    levels = np.floor(scaled)
+    levels += rng.random(scaled.shape, dtype=scaled.dtype) < (scaled - levels)
+    levels = np.minimum(levels, 2**bits - 1)
+    return levels.astype(np.uint16), np.hstack([low, step]).astype(np.float32)
+
+def _uniform_decode(levels, params, bits):
+    """ low + level * step. """
+    return params[:, :1] + levels.astype(params.dtype) * params[:, 1:]
+
+QUANTIZERS = {
+    "sign": (_sign_encode, _sign_decode),
+    "sign_scale": (_sign_scale_encode, _sign_scale_decode),
+    "uniform": (_uniform_encode, _uniform_decode),
+    "stochastic": (_stochastic_encode, _uniform_decode),
+}
+
+def bytes_per_vector(d, bits, params_per_row):
+    """ Size of one encoded vector: packed levels plus float32 per-row parameters. """
+    return -(-next_power_of_two(d) * bits // 8) + 4 * params_per_row
+
+def quantize_roundtrip(X, quantizer="sign", bits=1, seed=None):
+    """
+    Rotate the rows of X with an RHT, quantize with one of QUANTIZERS,
+    decode and inverse-rotate. Returns (recovered rows, encode seconds,
+    decode seconds, bytes per vector).
+    X:          (n x d) matrix of row vectors
+    quantizer:  name of an entry in QUANTIZERS
+    bits:       bits per coordinate ("sign" and "sign_scale" only support 1,
+                "uniform" and "stochastic" 1 to 16, since levels are stored as uint16)
+    seed:       seed for the sign diagonal and stochastic rounding
+    """
+    encode, decode = QUANTIZERS[quantizer]
+    if quantizer.startswith("sign") and bits != 1:
+        raise ValueError(f"quantizer {quantizer!r} only supports bits=1")
+    if not 1 <= bits <= 16:
+        raise ValueError(f"quantizer {quantizer!r} supports 1 to 16 bits, got {bits}")
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X)
+    signs = random_signs(X.shape[1], rng).astype(X.dtype)
+    start = time.perf_counter()
+    levels, params = encode(rht(X, signs), bits, rng)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    recovered = inverse_rht(decode(levels, params.astype(X.dtype), bits), signs, X.shape[1])
+    decode_time = time.perf_counter() - start
+    return recovered, encode_time, decode_time, bytes_per_vector(X.shape[1], bits, params.shape[1])
+
+def benchmark_quantizers(dims=(256, 1024, 4096), bits=(1, 2, 4, 8), quantizers=tuple(QUANTIZERS), trials=1000, dtype=np.float32, seed=0):
+    """
+    Sweep d x bits x quantizer on random unit vectors and report, per
+    setting, the mean MSE, encode and decode throughput (vectors per second,
+    rotation included) and bytes per vector. Settings a quantizer does not
+    support (sign quantizers with bits > 1, any quantizer with bits > 16)
+    are skipped.
+    Returns the list of result rows (dicts), and prints them as a table.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    print(f"{'quantizer':<12}{'d':>6}{'bits':>6}{'MSE':>12}{'enc vec/s':>12}{'dec vec/s':>12}{'bytes/vec':>11}")
+    for d in dims:
+        X = rng.standard_normal((trials, d), dtype=dtype)
+        X /= np.linalg.norm(X, axis=1, keepdims=True)
+        for b in bits:
+            for name in quantizers:
+                if (name.startswith("sign") and b != 1) or not 1 <= b <= 16:
+                    continue
+                recovered, encode_time, decode_time, size = quantize_roundtrip(X, name, b, seed)
+                row = {
+                    "quantizer": name, "d": d, "bits": b,
+                    "mse": float(np.mean((recovered - X) ** 2)),
+                    "encode_per_s": trials / encode_time,
+                    "decode_per_s": trials / decode_time,
+                    "bytes_per_vector": size,
+                }
+                results.append(row)
+                print(f"{name:<12}{d:>6}{b:>6}{row['mse']:>12.3e}{row['encode_per_s']:>12.0f}{row['decode_per_s']:>12.0f}{size:>11}")
+    return results
+
+
+
+# +++++++++++++++++ Packed Sign Store +++++++++++++++++ #
+
+# number of set bits in every byte, for numpy versions without np.bitwise_count
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def popcount(words):
+    """
+    Number of set bits in each row of an unsigned integer array (summed over the last axis).
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+class PackedSignStore:
+    """
+    Compact store of vectors quantized with the pipeline above (RHT, then
+    round by sign), keeping 1 bit per coordinate instead of a float64.
+    Each vector is stored as its packed sign bits plus its norm (float32);
+    the random sign diagonal is shared by the whole store and regenerated
+    from seed, so it costs nothing per vector (and codes from the same
+    store can be compared directly).
+    d:      dimension of the vectors (padded to a power of two for the RHT)
+    seed:   seed of the store's random sign diagonal
+    """
+    def __init__(self, d, seed=0):
+        self.d = d
+        self.seed = seed
+        self.dim = next_power_of_two(d)
+        self.signs = random_signs(d, np.random.default_rng(seed))
+        # codes are packed 8 coordinates per byte, rounded up to whole uint64 words
+        self.num_bytes = -(-self.dim // 64) * 8
+        # storage grows by doubling, so adding n vectors in batches copies O(n) bytes in total;
+        # only the first size rows are in use
+        self.size = 0
+        self._codes = np.zeros((0, self.num_bytes), dtype=np.uint8)
+        self._norms = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def codes(self):
+        """ (n x num_bytes) packed sign bits of the stored vectors (a view, no copy). """
+        return self._codes[:self.size]
+
+    @property
+    def norms(self):
+        """ float32 norms of the stored vectors (a view, no copy). """
+        return self._norms[:self.size]
+
+    def nbytes(self):
+        """ Memory held by the codes and norms (of the stored vectors, not the spare capacity). """
+        return self.codes.nbytes + self.norms.nbytes
+
+    def _reserve(self, capacity):
+        """ Grow the storage to at least capacity vectors, doubling it so growth is amortized. """
+        if capacity <= len(self._norms):
+            return
+        capacity = max(capacity, 2 * len(self._norms))
+        codes = np.zeros((capacity, self.num_bytes), dtype=np.uint8)
+        norms = np.zeros(capacity, dtype=np.float32)
+        codes[:self.size] = self.codes
+        norms[:self.size] = self.norms
+        self._codes, self._norms = codes, norms
+
+    def encode(self, X, batch_size=65536):
+        """
+        Encode a (n x d) matrix of vectors (or one vector) without storing it.
+        Returns (codes, norms): codes is (n x num_bytes) uint8 of packed sign
+        bits (1 = positive), norms is the float32 norm of each row.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float32))
+        codes = np.zeros((len(X), self.num_bytes), dtype=np.uint8)
+        norms = np.linalg.norm(X, axis=1).astype(np.float32)
+        for start in range(0, len(X), batch_size):
+            rotated = rht(X[start:start + batch_size], self.signs.astype(np.float32))
+            packed = np.packbits(rotated > 0, axis=1)
+            codes[start:start + len(packed), :packed.shape[1]] = packed
+        return codes, norms
+
+    def add(self, X):
+        """
+        Encode a (n x d) matrix of vectors and append them to the store.
+        Returns the indices the new vectors were stored at.
+        """
+        codes, norms = self.encode(X)
+        first = self.size
+        self._reserve(first + len(codes))
+        self._codes[first:first + len(codes)] = codes
+        self._norms[first:first + len(norms)] = norms
+        self.size += len(codes)
+        return np.arange(first, self.size)
+
+    def decode(self, indices=None, batch_size=65536):
+        """
+        Decode stored vectors back to approximate floats (a (n x d) float32 matrix):
+        unpack the signs, scale each row to its stored norm, inverse-rotate.
+        indices:    which stored vectors to decode (all of them if None)
+        """
+        indices = np.arange(len(self)) if indices is None else np.atleast_1d(indices)
+        out = np.empty((len(indices), self.d), dtype=np.float32)
+        for start in range(0, len(indices), batch_size):
+            rows = indices[start:start + batch_size]
+            bits = np.unpackbits(self.codes[rows], axis=1, count=self.dim)
+            # bit 1 -> +1, bit 0 -> -1, on the unit sphere like the quantized_vec above
+            quantized = (2 * bits.astype(np.float32) - 1) / np.sqrt(self.dim)
+            quantized *= self.norms[rows, None]
+            out[start:start + len(rows)] = inverse_rht(quantized, self.signs.astype(np.float32), self.d)
+        return out
+
+    def inner_products(self, query, indices=None, batch_size=65536):
+        """
+        Approximate inner products between query vectors and stored vectors,
+        computed directly on the packed codes: two quantized unit vectors
+        agree in D - hamming coordinates, so their inner product is
+        (D - 2 * hamming) / D, found with XOR + popcount on 64-bit words.
+        This equals the inner product of the decoded vectors (when d is a power of two).
+        query:      (q x d) matrix of vectors (or one vector)
+        indices:    which stored vectors to compare against (all of them if None)
+        batch_size: stored vectors compared at once, which bounds the scratch
+                    memory to a few batch_size x num_bytes arrays however large the store is
+        Returns a (q x n) matrix.
+        """
+        query_codes, query_norms = self.encode(query)
+        n = self.size if indices is None else len(indices)
+        out = np.empty((len(query_codes), n), dtype=np.float32)
+        for lo in range(0, n, batch_size):
+            hi = min(lo + batch_size, n)
+            rows = slice(lo, hi) if indices is None else indices[lo:hi]
+            stored_words = self.codes[rows].view(np.uint64)
+            norms = self.norms[rows]
+            for q, query_words in enumerate(query_codes.view(np.uint64)):
+                hamming = popcount(stored_words ^ query_words)
+                out[q, lo:hi] = (self.dim - 2 * hamming) / self.dim * query_norms[q] * norms
+        return out
+
+
+
 # +++++++++++++++++++ Main Function +++++++++++++++++++ #
 
 if __name__ == "__main__":
     # Determine variables
     d = 1024
-    mse_data = []
 
-    # Run 100 experiments
-    for _ in range(100):
-        mse_data.append(conduct_experiment(d))
+    # Run 100 experiments, all at once as one batch
+    stats = conduct_experiments(100, d)
 
     # Print results
-    print(f"Min MSE: \t{np.min(mse_data)}")
-    print(f"Mean MSE:\t {np.mean(mse_data)}")
-    print(f"Max MSE:\t {np.max(mse_data)}")
-
+    print(f"Min MSE: \t{stats['min']}")
+    print(f"Mean MSE:\t {stats['mean']}")
+    print(f"Max MSE:\t {stats['max']}")
 
 """
 CODE DESCRIPTION PARAGRAPH:
-- I only needed numpy and scipy to run the code.
+- I only needed numpy to run the code.
 - I created one helper function, conduct_experiment, to run the MSE.
+- conduct_experiments runs all 100 experiments at once as one (100 x d) batch.
+- The RHT is done with a fast Walsh-Hadamard transform (fwht) and random sign flips (random_signs).
 - Each experiment does the following:
     - Step 1: generate a random point on the d-dimensional unit sphere
     - Step 2: rotate point using RHT
@@ -85,10 +484,9 @@ CODE DESCRIPTION PARAGRAPH:
     .randn(d)            creates a random-number vector of size d
     .linalg.norm(v)      computes the norm of vector v
     .sign(v)             round values in vector v to either -1 or 1
-    .linalg.hadamdard(d) computes a hadamdard matrix of dimension d
+    fwht(v)              fast Walsh-Hadamard transform, O(d log d) instead of a d x d hadamard matrix
+    random_signs(d)      random +-1 diagonal that makes the Hadamard transform randomized
     .mean(data)          find mean value within data   
     .min(data)           find min value within data
     .max(data)           find max value within data
-    @                    allows for matrix multiplication
-    .T                   allows for matrix transpose (in our case, inversion)
 """
\ No newline at end of file